@@ -41,6 +41,7 @@ import importlib
 import inspect
 import os
 import pathlib
+import re
 import shutil
 import subprocess
 import sys
@@ -58,21 +59,20 @@ SYMBOLS_TO_SKIP = ["layer_test"]
 
 
 def copy_keras_codebase(source_dir, target_dir):
-    disallowed = [
-        "tools",
-        "integration_test",
-    ]
+    # Tests and the `tools` and `integration_test` directories are not shipped.
+    disallowed = re.compile(r"tools|integration_test|.*_test\.py")
 
     def ignore(path, names):
-        to_ignore = []
-        for name in names:
-            if name.endswith("_test.py"):
-                to_ignore.append(name)
-            elif name in disallowed:
-                to_ignore.append(name)
-        return to_ignore
-
-    shutil.copytree(source_dir, target_dir, ignore=ignore)
+        return [name for name in names if disallowed.fullmatch(name)]
+
+    # Only file contents are needed in the build tree; `shutil.copyfile` skips
+    # the extra stat/chmod/utime calls `shutil.copy2` makes for every file.
+    shutil.copytree(
+        source_dir,
+        target_dir,
+        ignore=ignore,
+        copy_function=shutil.copyfile,
+    )
 
 
 def convert_keras_imports(src_directory):
@@ -121,7 +121,7 @@ def convert_keras_imports(src_directory):
                     print(f"...processing {fpath}")
                 with open(fpath) as f:
                     contents = f.read()
-                lines = contents.split("\n")
+                lines = contents.splitlines(keepends=True)
                 in_string = False
                 new_lines = []
                 for line in lines:
@@ -135,7 +135,7 @@ def convert_keras_imports(src_directory):
                     new_lines.append(line)
 
                 with open(fpath, "w") as f:
-                    f.write("\n".join(new_lines) + "\n")
+                    f.write("".join(new_lines))
 
 
 def generate_keras_api_files(package_directory, src_directory):
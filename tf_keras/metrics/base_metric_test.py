@@ -598,14 +598,21 @@ class BinaryTruePositivesViaControlFlow(metrics.Metric):
     def update_state(self, y_true, y_pred, sample_weight=None):
         y_true = tf.cast(y_true, tf.bool)
         y_pred = tf.cast(y_pred, tf.bool)
-
-        for i in range(len(y_true)):
-            for j in range(len(y_true[i])):
+        if sample_weight is not None:
+            # Slice out the row weights once rather than once per element.
+            sample_weight = tf.convert_to_tensor(sample_weight)[:, 0]
+
+        # Tensor loop bounds let autograph turn the loops into
+        # `tf.while_loop`s.
+        num_rows = tf.shape(y_true)[0]
+        num_cols = tf.shape(y_true)[1]
+        for i in range(num_rows):
+            for j in range(num_cols):
                 if y_true[i][j] and y_pred[i][j]:
                     if sample_weight is None:
                         self.true_positives.assign_add(1)
                     else:
-                        self.true_positives.assign_add(sample_weight[i][0])
+                        self.true_positives.assign_add(sample_weight[i])
 
     def result(self):
         if tf.constant(True):
@@ -14,12 +14,12 @@
 # ==============================================================================
 """Tests for confusion metrics."""
 
+import functools
 import json
 
 import numpy as np
 import tensorflow.compat.v2 as tf
 from absl.testing import parameterized
-from tensorflow.python.platform import tf_logging
 
 from tf_keras import backend
 from tf_keras import layers
@@ -29,6 +29,145 @@ from tf_keras.testing_infra import test_combinations
 from tf_keras.testing_infra import test_utils
 from tf_keras.utils import metrics_utils
 
+try:
+    from scipy import special
+except ImportError:
+    special = None
+
+# Fixed inputs for the idempotency tests. These are generated once with NumPy
+# rather than with a seeded `tf.random.uniform` op on every test run.
+_RANDOM_Y_PRED = np.random.RandomState(1).uniform(size=(10, 3))
+_RANDOM_Y_TRUE = np.random.RandomState(1).randint(0, 2, size=(10, 3))
+
+# Inputs shared by the sensitivity/specificity/precision/recall "at" tests.
+_PRED_VALUES = [0.0, 0.1, 0.2, 0.3, 0.4, 0.01, 0.02, 0.25, 0.26, 0.26]
+_PRED_VALUES_RECALL = [0.0, 0.1, 0.2, 0.5, 0.6, 0.2, 0.5, 0.6, 0.8, 0.9]
+_LABEL_VALUES = np.array([0, 0, 0, 0, 0, 1, 1, 1, 1, 1], dtype=np.int32)
+_LABEL_VALUES_CLASS_ID = [0, 0, 0, 0, 0, 2, 2, 2, 2, 2]
+_WEIGHT_VALUES = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+# Per-element weights for the (4, 2) predictions in `MultiAUCTest`.
+_FULL_SAMPLE_WEIGHT = np.arange(4 * 2, dtype=np.float32).reshape(4, 2)
+
+
+def _blocks(values, rows=25, cols=4):
+    """Stacks `rows` x `cols` blocks, each filled with one of `values`."""
+    blocks = np.empty((len(values) * rows, cols), dtype=np.float32)
+    for i, value in enumerate(values):
+        blocks[i * rows : (i + 1) * rows] = value
+    return blocks
+
+
+# Five concatenated copies of a 20 sample batch with 5 samples in each cell
+# of the confusion matrix.
+_MERGE_Y_TRUE = _blocks([1, 0, 1, 0] * 5, rows=5, cols=1)
+_MERGE_Y_PRED = _blocks([1, 0, 0, 1] * 5, rows=5, cols=1)
+
+# Inputs for `ResetStatesTest`. The test model scores the 25 row blocks of
+# `_X_ALT` as positive, negative, negative, positive against the `_Y_ALT`
+# labels 1, 0, 1, 0, so every confusion matrix cell gets 25 samples.
+_ONES_X = np.ones((100, 4), dtype=np.float32)
+_ZEROS_X = np.zeros((100, 4), dtype=np.float32)
+_ONES_Y = np.ones((100, 1), dtype=np.float32)
+_ZEROS_Y = np.zeros((100, 1), dtype=np.float32)
+_X_ALT = _blocks([1, 0, 0, 1])
+_Y_ALT = _blocks([1, 0, 1, 0], cols=1)
+_X_ALT_COUNTS = {
+    "true_positives": 25.0,
+    "false_positives": 25.0,
+    "false_negatives": 25.0,
+    "true_negatives": 25.0,
+}
+_MIOU_X = np.array(
+    [[0, 0, 0, 0], [1, 1, 1, 1], [1, 0, 1, 0], [0, 1, 0, 1]], dtype=np.float32
+)
+_MIOU_Y = np.array([[0], [1], [1], [1]], dtype=np.float32)
+
+# Inputs for `AUCTest.test_extra_dims`.
+_EXTRA_DIMS_LABELS = np.asarray(
+    [[[1, 0, 0], [1, 0, 0]], [[0, 1, 1], [0, 1, 1]]], dtype=np.int32
+)
+if special is not None:
+    _EXTRA_DIMS_LOGITS = special.expit(
+        -np.array(
+            [
+                [[-10.0, 10.0, -10.0], [10.0, -10.0, 10.0]],
+                [[-12.0, 12.0, -12.0], [12.0, -12.0, 12.0]],
+            ],
+            dtype=np.float32,
+        )
+    )
+
+
+def _initialize_variables(test_case, *metric_objs):
+    """Initializes the metric variables; only needed in graph mode.
+
+    The variables of all `metric_objs` are initialized by a single op.
+    """
+    if not tf.executing_eagerly():
+        variables = [v for m in metric_objs for v in m.variables]
+        test_case.evaluate(tf.compat.v1.variables_initializer(variables))
+
+
+def _assert_all_close(test_case, result, expected, rtol=1e-3):
+    """Compares a metric result with `expected` as host NumPy values."""
+    if tf.executing_eagerly():
+        result = result.numpy()
+    else:
+        result = test_case.evaluate(result)
+    np.testing.assert_allclose(result, expected, rtol=rtol, atol=1e-6)
+
+
+def _update_and_result_fn(*metric_objs):
+    """Returns a `tf.function` updating `metric_objs` and fetching results.
+
+    Running all the updates and results in one function traces them
+    together instead of dispatching each metric op separately.
+    """
+
+    @tf.function(
+        input_signature=[
+            tf.TensorSpec((10,), tf.int64),
+            tf.TensorSpec((10,), tf.float64),
+        ]
+    )
+    def update_and_result(y_true, y_pred):
+        for metric_obj in metric_objs:
+            metric_obj.update_state(y_true, y_pred)
+        return [metric_obj.result() for metric_obj in metric_objs]
+
+    return update_and_result
+
+
+def _update_and_merge_states(test_case, metric_objs, y_true, y_pred):
+    """Updates each of `metric_objs` and merges them into the first one.
+
+    The inputs are split evenly along the batch axis, one slice per metric.
+    The updates run in a single `tf.function` call, while the merge itself
+    runs untraced so that `merge_state` is also covered outside a function.
+    """
+    y_true = np.split(np.asarray(y_true), len(metric_objs))
+    y_pred = np.split(np.asarray(y_pred), len(metric_objs))
+
+    @tf.function
+    def update_states():
+        for metric_obj, y_true_slice, y_pred_slice in zip(
+            metric_objs, y_true, y_pred
+        ):
+            metric_obj.update_state(y_true_slice, y_pred_slice)
+        return [metric_obj.result() for metric_obj in metric_objs]
+
+    test_case.evaluate(update_states())
+    test_case.evaluate(metric_objs[0].merge_state(metric_objs[1:]))
+
+
+def _tile_predictions(pred_values, num_classes=3):
+    """Repeats a 1D list of predictions across `num_classes` columns."""
+    pred_values = np.asarray(pred_values, dtype=np.float32)
+    return np.broadcast_to(
+        pred_values[:, None], (pred_values.size, num_classes)
+    )
+
 
 @test_combinations.generate(test_combinations.combine(mode=["graph", "eager"]))
 class FalsePositivesTest(tf.test.TestCase, parameterized.TestCase):
@@ -46,7 +185,7 @@ class FalsePositivesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted(self):
         fp_obj = metrics.FalsePositives()
-        self.evaluate(tf.compat.v1.variables_initializer(fp_obj.variables))
+        _initialize_variables(self, fp_obj)
 
         y_true = tf.constant(
             ((0, 1, 0, 1, 0), (0, 0, 1, 1, 1), (1, 1, 1, 1, 0), (0, 0, 0, 0, 1))
@@ -62,7 +201,7 @@ class FalsePositivesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_weighted(self):
         fp_obj = metrics.FalsePositives()
-        self.evaluate(tf.compat.v1.variables_initializer(fp_obj.variables))
+        _initialize_variables(self, fp_obj)
         y_true = tf.constant(
             ((0, 1, 0, 1, 0), (0, 0, 1, 1, 1), (1, 1, 1, 1, 0), (0, 0, 0, 0, 1))
         )
@@ -75,7 +214,7 @@ class FalsePositivesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_with_thresholds(self):
         fp_obj = metrics.FalsePositives(thresholds=[0.15, 0.5, 0.85])
-        self.evaluate(tf.compat.v1.variables_initializer(fp_obj.variables))
+        _initialize_variables(self, fp_obj)
 
         y_pred = tf.constant(
             (
@@ -96,7 +235,7 @@ class FalsePositivesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_weighted_with_thresholds(self):
         fp_obj = metrics.FalsePositives(thresholds=[0.15, 0.5, 0.85])
-        self.evaluate(tf.compat.v1.variables_initializer(fp_obj.variables))
+        _initialize_variables(self, fp_obj)
 
         y_pred = tf.constant(
             (
@@ -149,7 +288,7 @@ class FalseNegativesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted(self):
         fn_obj = metrics.FalseNegatives()
-        self.evaluate(tf.compat.v1.variables_initializer(fn_obj.variables))
+        _initialize_variables(self, fn_obj)
 
         y_true = tf.constant(
             ((0, 1, 0, 1, 0), (0, 0, 1, 1, 1), (1, 1, 1, 1, 0), (0, 0, 0, 0, 1))
@@ -165,7 +304,7 @@ class FalseNegativesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_weighted(self):
         fn_obj = metrics.FalseNegatives()
-        self.evaluate(tf.compat.v1.variables_initializer(fn_obj.variables))
+        _initialize_variables(self, fn_obj)
         y_true = tf.constant(
             ((0, 1, 0, 1, 0), (0, 0, 1, 1, 1), (1, 1, 1, 1, 0), (0, 0, 0, 0, 1))
         )
@@ -178,7 +317,7 @@ class FalseNegativesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_with_thresholds(self):
         fn_obj = metrics.FalseNegatives(thresholds=[0.15, 0.5, 0.85])
-        self.evaluate(tf.compat.v1.variables_initializer(fn_obj.variables))
+        _initialize_variables(self, fn_obj)
 
         y_pred = tf.constant(
             (
@@ -199,7 +338,7 @@ class FalseNegativesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_weighted_with_thresholds(self):
         fn_obj = metrics.FalseNegatives(thresholds=[0.15, 0.5, 0.85])
-        self.evaluate(tf.compat.v1.variables_initializer(fn_obj.variables))
+        _initialize_variables(self, fn_obj)
 
         y_pred = tf.constant(
             (
@@ -234,7 +373,7 @@ class TrueNegativesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted(self):
         tn_obj = metrics.TrueNegatives()
-        self.evaluate(tf.compat.v1.variables_initializer(tn_obj.variables))
+        _initialize_variables(self, tn_obj)
 
         y_true = tf.constant(
             ((0, 1, 0, 1, 0), (0, 0, 1, 1, 1), (1, 1, 1, 1, 0), (0, 0, 0, 0, 1))
@@ -250,7 +389,7 @@ class TrueNegativesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_weighted(self):
         tn_obj = metrics.TrueNegatives()
-        self.evaluate(tf.compat.v1.variables_initializer(tn_obj.variables))
+        _initialize_variables(self, tn_obj)
         y_true = tf.constant(
             ((0, 1, 0, 1, 0), (0, 0, 1, 1, 1), (1, 1, 1, 1, 0), (0, 0, 0, 0, 1))
         )
@@ -263,7 +402,7 @@ class TrueNegativesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_with_thresholds(self):
         tn_obj = metrics.TrueNegatives(thresholds=[0.15, 0.5, 0.85])
-        self.evaluate(tf.compat.v1.variables_initializer(tn_obj.variables))
+        _initialize_variables(self, tn_obj)
 
         y_pred = tf.constant(
             (
@@ -284,7 +423,7 @@ class TrueNegativesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_weighted_with_thresholds(self):
         tn_obj = metrics.TrueNegatives(thresholds=[0.15, 0.5, 0.85])
-        self.evaluate(tf.compat.v1.variables_initializer(tn_obj.variables))
+        _initialize_variables(self, tn_obj)
 
         y_pred = tf.constant(
             (
@@ -319,7 +458,7 @@ class TruePositivesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted(self):
         tp_obj = metrics.TruePositives()
-        self.evaluate(tf.compat.v1.variables_initializer(tp_obj.variables))
+        _initialize_variables(self, tp_obj)
 
         y_true = tf.constant(
             ((0, 1, 0, 1, 0), (0, 0, 1, 1, 1), (1, 1, 1, 1, 0), (0, 0, 0, 0, 1))
@@ -335,7 +474,7 @@ class TruePositivesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_weighted(self):
         tp_obj = metrics.TruePositives()
-        self.evaluate(tf.compat.v1.variables_initializer(tp_obj.variables))
+        _initialize_variables(self, tp_obj)
         y_true = tf.constant(
             ((0, 1, 0, 1, 0), (0, 0, 1, 1, 1), (1, 1, 1, 1, 0), (0, 0, 0, 0, 1))
         )
@@ -348,7 +487,7 @@ class TruePositivesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_with_thresholds(self):
         tp_obj = metrics.TruePositives(thresholds=[0.15, 0.5, 0.85])
-        self.evaluate(tf.compat.v1.variables_initializer(tp_obj.variables))
+        _initialize_variables(self, tp_obj)
 
         y_pred = tf.constant(
             (
@@ -369,7 +508,7 @@ class TruePositivesTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_weighted_with_thresholds(self):
         tp_obj = metrics.TruePositives(thresholds=[0.15, 0.5, 0.85])
-        self.evaluate(tf.compat.v1.variables_initializer(tp_obj.variables))
+        _initialize_variables(self, tp_obj)
 
         y_pred = tf.constant(
             (
@@ -416,7 +555,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         y_pred = tf.random.uniform(shape=(10, 3))
         y_true = tf.random.uniform(shape=(10, 3))
         update_op = p_obj.update_state(y_true, y_pred)
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
 
         # Run several updates.
         for _ in range(10):
@@ -433,7 +572,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         p_obj = metrics.Precision()
         y_pred = tf.constant([1, 0, 1, 0], shape=(1, 4))
         y_true = tf.constant([0, 1, 1, 0], shape=(1, 4))
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
         result = p_obj(y_true, y_pred)
         self.assertAlmostEqual(0.5, self.evaluate(result))
 
@@ -442,7 +581,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         inputs = np.random.randint(0, 2, size=(100, 1))
         y_pred = tf.constant(inputs)
         y_true = tf.constant(1 - inputs)
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
         result = p_obj(y_true, y_pred)
         self.assertAlmostEqual(0, self.evaluate(result))
 
@@ -450,7 +589,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         p_obj = metrics.Precision()
         y_pred = tf.constant([[1, 0, 1, 0], [1, 0, 1, 0]])
         y_true = tf.constant([[0, 1, 1, 0], [1, 0, 0, 1]])
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
         result = p_obj(
             y_true,
             y_pred,
@@ -465,7 +604,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         p_obj = metrics.Precision()
         y_pred = tf.constant([0, 0, 0, 0])
         y_true = tf.constant([0, 0, 0, 0])
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
         result = p_obj(y_true, y_pred)
         self.assertEqual(0, self.evaluate(result))
 
@@ -473,7 +612,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         p_obj = metrics.Precision(thresholds=[0.5, 0.7])
         y_pred = tf.constant([1, 0, 0.6, 0], shape=(1, 4))
         y_true = tf.constant([0, 1, 1, 0], shape=(1, 4))
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
         result = p_obj(y_true, y_pred)
         self.assertArrayNear([0.5, 0.0], self.evaluate(result), 0)
 
@@ -482,7 +621,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         y_true = tf.constant([[0, 1], [1, 0]], shape=(2, 2))
         y_pred = tf.constant([[1, 0], [0.6, 0]], shape=(2, 2), dtype=tf.float32)
         weights = tf.constant([[4, 0], [3, 1]], shape=(2, 2), dtype=tf.float32)
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
         result = p_obj(y_true, y_pred, sample_weight=weights)
         weighted_tp = 0 + 3.0
         weighted_positives = (0 + 3.0) + (4.0 + 0.0)
@@ -496,7 +635,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         y_true = tf.constant([[0, 1], [1, 0]], shape=(2, 2))
         y_pred = tf.constant([[1, 0], [0.6, 0]], shape=(2, 2), dtype=tf.float32)
         weights = tf.constant([[4, 0], [3, 1]], shape=(2, 2), dtype=tf.float32)
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
         update_op = p_obj.update_state(y_true, y_pred, sample_weight=weights)
         for _ in range(2):
             self.evaluate(update_op)
@@ -514,7 +653,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         p_obj = metrics.Precision(top_k=3)
         y_pred = tf.constant([0.2, 0.1, 0.5, 0, 0.2], shape=(1, 5))
         y_true = tf.constant([0, 1, 1, 0, 0], shape=(1, 5))
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
         result = p_obj(y_true, y_pred)
         self.assertAlmostEqual(1.0 / 3, self.evaluate(result))
 
@@ -522,7 +661,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
         p_obj = metrics.Precision(top_k=3)
         y_pred1 = tf.constant([0.2, 0.1, 0.4, 0, 0.2], shape=(1, 5))
         y_true1 = tf.constant([0, 1, 1, 0, 1], shape=(1, 5))
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
         self.evaluate(
             p_obj(
                 y_true1, y_pred1, sample_weight=tf.constant([[1, 4, 2, 3, 5]])
@@ -540,7 +679,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_class_id(self):
         p_obj = metrics.Precision(class_id=2)
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
 
         y_pred = tf.constant([0.2, 0.1, 0.6, 0, 0.2], shape=(1, 5))
         y_true = tf.constant([0, 1, 1, 0, 0], shape=(1, 5))
@@ -565,7 +704,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_top_k_and_class_id(self):
         p_obj = metrics.Precision(class_id=2, top_k=2)
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
 
         y_pred = tf.constant([0.2, 0.6, 0.3, 0, 0.2], shape=(1, 5))
         y_true = tf.constant([0, 1, 1, 0, 0], shape=(1, 5))
@@ -583,7 +722,7 @@ class PrecisionTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_top_k_and_threshold(self):
         p_obj = metrics.Precision(thresholds=0.7, top_k=2)
-        self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
+        _initialize_variables(self, p_obj)
 
         y_pred = tf.constant([0.2, 0.8, 0.6, 0, 0.2], shape=(1, 5))
         y_true = tf.constant([0, 1, 1, 0, 1], shape=(1, 5))
@@ -622,7 +761,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         y_pred = tf.random.uniform(shape=(10, 3))
         y_true = tf.random.uniform(shape=(10, 3))
         update_op = r_obj.update_state(y_true, y_pred)
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
 
         # Run several updates.
         for _ in range(10):
@@ -639,7 +778,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         r_obj = metrics.Recall()
         y_pred = tf.constant([1, 0, 1, 0], shape=(1, 4))
         y_true = tf.constant([0, 1, 1, 0], shape=(1, 4))
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
         result = r_obj(y_true, y_pred)
         self.assertAlmostEqual(0.5, self.evaluate(result))
 
@@ -648,7 +787,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         inputs = np.random.randint(0, 2, size=(100, 1))
         y_pred = tf.constant(inputs)
         y_true = tf.constant(1 - inputs)
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
         result = r_obj(y_true, y_pred)
         self.assertAlmostEqual(0, self.evaluate(result))
 
@@ -656,7 +795,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         r_obj = metrics.Recall()
         y_pred = tf.constant([[1, 0, 1, 0], [0, 1, 0, 1]])
         y_true = tf.constant([[0, 1, 1, 0], [1, 0, 0, 1]])
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
         result = r_obj(
             y_true,
             y_pred,
@@ -671,7 +810,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         r_obj = metrics.Recall()
         y_pred = tf.constant([0, 0, 0, 0])
         y_true = tf.constant([0, 0, 0, 0])
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
         result = r_obj(y_true, y_pred)
         self.assertEqual(0, self.evaluate(result))
 
@@ -679,7 +818,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         r_obj = metrics.Recall(thresholds=[0.5, 0.7])
         y_pred = tf.constant([1, 0, 0.6, 0], shape=(1, 4))
         y_true = tf.constant([0, 1, 1, 0], shape=(1, 4))
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
         result = r_obj(y_true, y_pred)
         self.assertArrayNear([0.5, 0.0], self.evaluate(result), 0)
 
@@ -688,7 +827,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         y_true = tf.constant([[0, 1], [1, 0]], shape=(2, 2))
         y_pred = tf.constant([[1, 0], [0.6, 0]], shape=(2, 2), dtype=tf.float32)
         weights = tf.constant([[1, 4], [3, 2]], shape=(2, 2), dtype=tf.float32)
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
         result = r_obj(y_true, y_pred, sample_weight=weights)
         weighted_tp = 0 + 3.0
         weighted_positives = (0 + 3.0) + (4.0 + 0.0)
@@ -700,7 +839,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         y_true = tf.constant([[0, 1], [1, 0]], shape=(2, 2))
         y_pred = tf.constant([[1, 0], [0.6, 0]], shape=(2, 2), dtype=tf.float32)
         weights = tf.constant([[1, 4], [3, 2]], shape=(2, 2), dtype=tf.float32)
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
         update_op = r_obj.update_state(y_true, y_pred, sample_weight=weights)
         for _ in range(2):
             self.evaluate(update_op)
@@ -718,7 +857,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         r_obj = metrics.Recall(top_k=3)
         y_pred = tf.constant([0.2, 0.1, 0.5, 0, 0.2], shape=(1, 5))
         y_true = tf.constant([0, 1, 1, 0, 0], shape=(1, 5))
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
         result = r_obj(y_true, y_pred)
         self.assertAlmostEqual(0.5, self.evaluate(result))
 
@@ -726,7 +865,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
         r_obj = metrics.Recall(top_k=3)
         y_pred1 = tf.constant([0.2, 0.1, 0.4, 0, 0.2], shape=(1, 5))
         y_true1 = tf.constant([0, 1, 1, 0, 1], shape=(1, 5))
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
         self.evaluate(
             r_obj(
                 y_true1, y_pred1, sample_weight=tf.constant([[1, 4, 2, 3, 5]])
@@ -744,7 +883,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_class_id(self):
         r_obj = metrics.Recall(class_id=2)
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
 
         y_pred = tf.constant([0.2, 0.1, 0.6, 0, 0.2], shape=(1, 5))
         y_true = tf.constant([0, 1, 1, 0, 0], shape=(1, 5))
@@ -769,7 +908,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_top_k_and_class_id(self):
         r_obj = metrics.Recall(class_id=2, top_k=2)
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
 
         y_pred = tf.constant([0.2, 0.6, 0.3, 0, 0.2], shape=(1, 5))
         y_true = tf.constant([0, 1, 1, 0, 0], shape=(1, 5))
@@ -787,7 +926,7 @@ class RecallTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_unweighted_top_k_and_threshold(self):
         r_obj = metrics.Recall(thresholds=0.7, top_k=2)
-        self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
+        _initialize_variables(self, r_obj)
 
         y_pred = tf.constant([0.2, 0.8, 0.6, 0, 0.2], shape=(1, 5))
         y_true = tf.constant([1, 1, 1, 0, 1], shape=(1, 5))
@@ -824,10 +963,10 @@ class SensitivityAtSpecificityTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_value_is_idempotent(self):
         s_obj = metrics.SensitivityAtSpecificity(0.7)
-        y_pred = tf.random.uniform((10, 3), maxval=1, dtype=tf.float32, seed=1)
-        y_true = tf.random.uniform((10, 3), maxval=2, dtype=tf.int64, seed=1)
+        y_pred = tf.constant(_RANDOM_Y_PRED, dtype=tf.float32)
+        y_true = tf.constant(_RANDOM_Y_TRUE, dtype=tf.int64)
         update_op = s_obj.update_state(y_true, y_pred)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
 
         # Run several updates.
         for _ in range(10):
@@ -841,59 +980,48 @@ class SensitivityAtSpecificityTest(tf.test.TestCase, parameterized.TestCase):
             )
 
     def test_unweighted_all_correct(self):
-        with self.test_session():
+        with self.cached_session():
             s_obj = metrics.SensitivityAtSpecificity(0.7)
             inputs = np.random.randint(0, 2, size=(100, 1))
             y_pred = tf.constant(inputs, dtype=tf.float32)
             y_true = tf.constant(inputs)
-            self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+            _initialize_variables(self, s_obj)
             result = s_obj(y_true, y_pred)
             self.assertAlmostEqual(1, self.evaluate(result))
 
     def test_unweighted_high_specificity(self):
         s_obj = metrics.SensitivityAtSpecificity(0.8)
         pred_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.1, 0.45, 0.5, 0.8, 0.9]
-        label_values = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
 
         y_pred = tf.constant(pred_values, dtype=tf.float32)
-        y_true = tf.constant(label_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_true = tf.constant(_LABEL_VALUES)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         self.assertAlmostEqual(0.8, self.evaluate(result))
 
     def test_unweighted_low_specificity(self):
         s_obj = metrics.SensitivityAtSpecificity(0.4)
-        pred_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.01, 0.02, 0.25, 0.26, 0.26]
-        label_values = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
-
-        y_pred = tf.constant(pred_values, dtype=tf.float32)
-        y_true = tf.constant(label_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_PRED_VALUES, dtype=tf.float32)
+        y_true = tf.constant(_LABEL_VALUES)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         self.assertAlmostEqual(0.6, self.evaluate(result))
 
     def test_unweighted_class_id(self):
         s_obj = metrics.SpecificityAtSensitivity(0.4, class_id=2)
-        pred_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.01, 0.02, 0.25, 0.26, 0.26]
-        label_values = [0, 0, 0, 0, 0, 2, 2, 2, 2, 2]
-
-        y_pred = tf.transpose([pred_values] * 3)
-        y_true = tf.one_hot(label_values, depth=3)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_tile_predictions(_PRED_VALUES))
+        y_true = tf.one_hot(_LABEL_VALUES_CLASS_ID, depth=3)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         self.assertAlmostEqual(0.6, self.evaluate(result))
 
     @parameterized.parameters([tf.bool, tf.int32, tf.float32])
     def test_weighted(self, label_dtype):
         s_obj = metrics.SensitivityAtSpecificity(0.4)
-        pred_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.01, 0.02, 0.25, 0.26, 0.26]
-        label_values = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
-        weight_values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-
-        y_pred = tf.constant(pred_values, dtype=tf.float32)
-        y_true = tf.cast(label_values, dtype=label_dtype)
-        weights = tf.constant(weight_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_PRED_VALUES, dtype=tf.float32)
+        y_true = tf.cast(_LABEL_VALUES, dtype=label_dtype)
+        weights = tf.constant(_WEIGHT_VALUES)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred, sample_weight=weights)
         self.assertAlmostEqual(0.675, self.evaluate(result))
 
@@ -937,10 +1065,10 @@ class SpecificityAtSensitivityTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_value_is_idempotent(self):
         s_obj = metrics.SpecificityAtSensitivity(0.7)
-        y_pred = tf.random.uniform((10, 3), maxval=1, dtype=tf.float32, seed=1)
-        y_true = tf.random.uniform((10, 3), maxval=2, dtype=tf.int64, seed=1)
+        y_pred = tf.constant(_RANDOM_Y_PRED, dtype=tf.float32)
+        y_true = tf.constant(_RANDOM_Y_TRUE, dtype=tf.int64)
         update_op = s_obj.update_state(y_true, y_pred)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
 
         # Run several updates.
         for _ in range(10):
@@ -958,54 +1086,41 @@ class SpecificityAtSensitivityTest(tf.test.TestCase, parameterized.TestCase):
         inputs = np.random.randint(0, 2, size=(100, 1))
         y_pred = tf.constant(inputs, dtype=tf.float32)
         y_true = tf.constant(inputs)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         self.assertAlmostEqual(1, self.evaluate(result))
 
     def test_unweighted_high_sensitivity(self):
         s_obj = metrics.SpecificityAtSensitivity(1.0)
-        pred_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.01, 0.02, 0.25, 0.26, 0.26]
-        label_values = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
-
-        y_pred = tf.constant(pred_values, dtype=tf.float32)
-        y_true = tf.constant(label_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_PRED_VALUES, dtype=tf.float32)
+        y_true = tf.constant(_LABEL_VALUES)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         self.assertAlmostEqual(0.2, self.evaluate(result))
 
     def test_unweighted_low_sensitivity(self):
         s_obj = metrics.SpecificityAtSensitivity(0.4)
-        pred_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.01, 0.02, 0.25, 0.26, 0.26]
-        label_values = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
-
-        y_pred = tf.constant(pred_values, dtype=tf.float32)
-        y_true = tf.constant(label_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_PRED_VALUES, dtype=tf.float32)
+        y_true = tf.constant(_LABEL_VALUES)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         self.assertAlmostEqual(0.6, self.evaluate(result))
 
     def test_unweighted_class_id(self):
         s_obj = metrics.SpecificityAtSensitivity(0.4, class_id=2)
-        pred_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.01, 0.02, 0.25, 0.26, 0.26]
-        label_values = [0, 0, 0, 0, 0, 2, 2, 2, 2, 2]
-
-        y_pred = tf.transpose([pred_values] * 3)
-        y_true = tf.one_hot(label_values, depth=3)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_tile_predictions(_PRED_VALUES))
+        y_true = tf.one_hot(_LABEL_VALUES_CLASS_ID, depth=3)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         self.assertAlmostEqual(0.6, self.evaluate(result))
 
     @parameterized.parameters([tf.bool, tf.int32, tf.float32])
     def test_weighted(self, label_dtype):
         s_obj = metrics.SpecificityAtSensitivity(0.4)
-        pred_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.01, 0.02, 0.25, 0.26, 0.26]
-        label_values = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
-        weight_values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-
-        y_pred = tf.constant(pred_values, dtype=tf.float32)
-        y_true = tf.cast(label_values, dtype=label_dtype)
-        weights = tf.constant(weight_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_PRED_VALUES, dtype=tf.float32)
+        y_true = tf.cast(_LABEL_VALUES, dtype=label_dtype)
+        weights = tf.constant(_WEIGHT_VALUES)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred, sample_weight=weights)
         self.assertAlmostEqual(0.4, self.evaluate(result))
 
@@ -1044,10 +1159,10 @@ class PrecisionAtRecallTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_value_is_idempotent(self):
         s_obj = metrics.PrecisionAtRecall(0.7)
-        y_pred = tf.random.uniform((10, 3), maxval=1, dtype=tf.float32, seed=1)
-        y_true = tf.random.uniform((10, 3), maxval=2, dtype=tf.int64, seed=1)
+        y_pred = tf.constant(_RANDOM_Y_PRED, dtype=tf.float32)
+        y_true = tf.constant(_RANDOM_Y_TRUE, dtype=tf.int64)
         update_op = s_obj.update_state(y_true, y_pred)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
 
         # Run several updates.
         for _ in range(10):
@@ -1065,42 +1180,33 @@ class PrecisionAtRecallTest(tf.test.TestCase, parameterized.TestCase):
         inputs = np.random.randint(0, 2, size=(100, 1))
         y_pred = tf.constant(inputs, dtype=tf.float32)
         y_true = tf.constant(inputs)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         self.assertAlmostEqual(1, self.evaluate(result))
 
     def test_unweighted_high_recall(self):
         s_obj = metrics.PrecisionAtRecall(0.8)
-        pred_values = [0.0, 0.1, 0.2, 0.5, 0.6, 0.2, 0.5, 0.6, 0.8, 0.9]
-        label_values = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
-
-        y_pred = tf.constant(pred_values, dtype=tf.float32)
-        y_true = tf.constant(label_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_PRED_VALUES_RECALL, dtype=tf.float32)
+        y_true = tf.constant(_LABEL_VALUES)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         # For 0.5 < decision threshold < 0.6.
         self.assertAlmostEqual(2.0 / 3, self.evaluate(result))
 
     def test_unweighted_low_recall(self):
         s_obj = metrics.PrecisionAtRecall(0.6)
-        pred_values = [0.0, 0.1, 0.2, 0.5, 0.6, 0.2, 0.5, 0.6, 0.8, 0.9]
-        label_values = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
-
-        y_pred = tf.constant(pred_values, dtype=tf.float32)
-        y_true = tf.constant(label_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_PRED_VALUES_RECALL, dtype=tf.float32)
+        y_true = tf.constant(_LABEL_VALUES)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         # For 0.2 < decision threshold < 0.5.
         self.assertAlmostEqual(0.75, self.evaluate(result))
 
     def test_unweighted_class_id(self):
         s_obj = metrics.PrecisionAtRecall(0.6, class_id=2)
-        pred_values = [0.0, 0.1, 0.2, 0.5, 0.6, 0.2, 0.5, 0.6, 0.8, 0.9]
-        label_values = [0, 0, 0, 0, 0, 2, 2, 2, 2, 2]
-
-        y_pred = tf.transpose([pred_values] * 3)
-        y_true = tf.one_hot(label_values, depth=3)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        y_pred = tf.constant(_tile_predictions(_PRED_VALUES_RECALL))
+        y_true = tf.one_hot(_LABEL_VALUES_CLASS_ID, depth=3)
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         # For 0.2 < decision threshold < 0.5.
         self.assertAlmostEqual(0.75, self.evaluate(result))
@@ -1108,14 +1214,12 @@ class PrecisionAtRecallTest(tf.test.TestCase, parameterized.TestCase):
     @parameterized.parameters([tf.bool, tf.int32, tf.float32])
     def test_weighted(self, label_dtype):
         s_obj = metrics.PrecisionAtRecall(7.0 / 8)
-        pred_values = [0.0, 0.1, 0.2, 0.5, 0.6, 0.2, 0.5, 0.6, 0.8, 0.9]
-        label_values = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
         weight_values = [2, 1, 2, 1, 2, 1, 2, 2, 1, 2]
 
-        y_pred = tf.constant(pred_values, dtype=tf.float32)
-        y_true = tf.cast(label_values, dtype=label_dtype)
+        y_pred = tf.constant(_PRED_VALUES_RECALL, dtype=tf.float32)
+        y_true = tf.cast(_LABEL_VALUES, dtype=label_dtype)
         weights = tf.constant(weight_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred, sample_weight=weights)
         # For 0.0 < decision threshold < 0.2.
         self.assertAlmostEqual(0.7, self.evaluate(result))
@@ -1155,10 +1259,10 @@ class RecallAtPrecisionTest(tf.test.TestCase, parameterized.TestCase):
 
     def test_value_is_idempotent(self):
         s_obj = metrics.RecallAtPrecision(0.7)
-        y_pred = tf.random.uniform((10, 3), maxval=1, dtype=tf.float32, seed=1)
-        y_true = tf.random.uniform((10, 3), maxval=2, dtype=tf.int64, seed=1)
+        y_pred = tf.constant(_RANDOM_Y_PRED, dtype=tf.float32)
+        y_true = tf.constant(_RANDOM_Y_TRUE, dtype=tf.int64)
         update_op = s_obj.update_state(y_true, y_pred)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
 
         # Run several updates.
         for _ in range(10):
@@ -1176,7 +1280,7 @@ class RecallAtPrecisionTest(tf.test.TestCase, parameterized.TestCase):
         inputs = np.random.randint(0, 2, size=(100, 1))
         y_pred = tf.constant(inputs, dtype=tf.float32)
         y_true = tf.constant(inputs)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         self.assertAlmostEqual(1, self.evaluate(result))
 
@@ -1203,7 +1307,7 @@ class RecallAtPrecisionTest(tf.test.TestCase, parameterized.TestCase):
         # 1/6].
         y_pred = tf.constant(pred_values, dtype=tf.float32)
         y_true = tf.constant(label_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         # The precision 0.75 can be reached at thresholds 0.4<=t<0.45.
         self.assertAlmostEqual(0.5, self.evaluate(result))
@@ -1231,7 +1335,7 @@ class RecallAtPrecisionTest(tf.test.TestCase, parameterized.TestCase):
         # 1/6].
         y_pred = tf.constant(pred_values, dtype=tf.float32)
         y_true = tf.constant(label_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         # The precision 5/7 can be reached at thresholds 00.3<=t<0.35.
         self.assertAlmostEqual(5.0 / 6, self.evaluate(result))
@@ -1257,9 +1361,9 @@ class RecallAtPrecisionTest(tf.test.TestCase, parameterized.TestCase):
         # 1].
         # recalls:    [1,   1,    5/6, 5/6, 5/6, 5/6, 2/3, 1/2, 1/2, 1/3, 1/6,
         # 1/6].
-        y_pred = tf.transpose([pred_values] * 3)
+        y_pred = tf.constant(_tile_predictions(pred_values))
         y_true = tf.one_hot(label_values, depth=3)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         # The precision 5/7 can be reached at thresholds 00.3<=t<0.35.
         self.assertAlmostEqual(5.0 / 6, self.evaluate(result))
@@ -1273,7 +1377,7 @@ class RecallAtPrecisionTest(tf.test.TestCase, parameterized.TestCase):
         y_pred = tf.constant(pred_values, dtype=tf.float32)
         y_true = tf.cast(label_values, dtype=label_dtype)
         weights = tf.constant(weight_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred, sample_weight=weights)
         self.assertAlmostEqual(0.6, self.evaluate(result))
 
@@ -1283,7 +1387,7 @@ class RecallAtPrecisionTest(tf.test.TestCase, parameterized.TestCase):
         label_values = [1, 1, 0, 0]
         y_pred = tf.constant(pred_values, dtype=tf.float32)
         y_true = tf.constant(label_values)
-        self.evaluate(tf.compat.v1.variables_initializer(s_obj.variables))
+        _initialize_variables(self, s_obj)
         result = s_obj(y_true, y_pred)
         # The highest possible precision is 1/2 which is below the required
         # value, expect 0 recall.
@@ -1304,17 +1408,21 @@ class RecallAtPrecisionTest(tf.test.TestCase, parameterized.TestCase):
 
 @test_combinations.generate(test_combinations.combine(mode=["graph", "eager"]))
 class AUCTest(tf.test.TestCase, parameterized.TestCase):
-    def setup(self):
-        self.num_thresholds = 3
-        self.y_pred = tf.constant([0, 0.5, 0.3, 0.9], dtype=tf.float32)
-        self.y_pred_multi_label = tf.constant(
-            [[0.0, 0.4], [0.5, 0.7], [0.3, 0.2], [0.9, 0.3]], dtype=tf.float32
-        )
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.num_thresholds = 3
+        cls._y_pred = np.array([0, 0.5, 0.3, 0.9], dtype=np.float32)
         epsilon = 1e-12
-        self.y_pred_logits = -tf.math.log(1.0 / (self.y_pred + epsilon) - 1.0)
-        self.y_true = tf.constant([0, 0, 1, 1])
-        self.y_true_multi_label = tf.constant([[0, 0], [1, 1], [1, 1], [1, 0]])
-        self.sample_weight = [1, 2, 3, 4]
+        cls._y_pred_logits = -np.log(1.0 / (cls._y_pred + epsilon) - 1.0)
+        cls._y_pred_multi_label = np.array(
+            [[0.0, 0.4], [0.5, 0.7], [0.3, 0.2], [0.9, 0.3]], dtype=np.float32
+        )
+        cls._y_true = np.array([0, 0, 1, 1], dtype=np.int32)
+        cls._y_true_multi_label = np.array(
+            [[0, 0], [1, 1], [1, 1], [1, 0]], dtype=np.int32
+        )
+        cls.sample_weight = np.array([1, 2, 3, 4], dtype=np.float32)
 
         # threshold values are [0 - 1e-7, 0.5, 1 + 1e-7]
         # y_pred when threshold = 0 - 1e-7  : [1, 1, 1, 1]
@@ -1337,6 +1445,15 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
 
         # tp = [7, 4, 0], fp = [3, 0, 0], fn = [0, 3, 7], tn = [0, 3, 3]
 
+    def setup(self):
+        # Tensors are built inside each test so that they belong to the
+        # graph of the graph-mode runs.
+        self.y_pred = tf.constant(self._y_pred)
+        self.y_pred_multi_label = tf.constant(self._y_pred_multi_label)
+        self.y_pred_logits = tf.constant(self._y_pred_logits)
+        self.y_true = tf.constant(self._y_true)
+        self.y_true_multi_label = tf.constant(self._y_true_multi_label)
+
     def test_config(self):
         self.setup()
         auc_obj = metrics.AUC(
@@ -1421,7 +1538,7 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
     def test_value_is_idempotent(self):
         self.setup()
         auc_obj = metrics.AUC(num_thresholds=3)
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
 
         # Run several updates.
         update_op = auc_obj.update_state(self.y_true, self.y_pred)
@@ -1438,14 +1555,14 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
     def test_unweighted_all_correct(self):
         self.setup()
         auc_obj = metrics.AUC()
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
         result = auc_obj(self.y_true, self.y_true)
         self.assertEqual(self.evaluate(result), 1)
 
     def test_unweighted(self):
         self.setup()
         auc_obj = metrics.AUC(num_thresholds=self.num_thresholds)
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
         result = auc_obj(self.y_true, self.y_pred)
 
         # tp = [2, 1, 0], fp = [2, 0, 0], fn = [0, 1, 2], tn = [0, 2, 2]
@@ -1454,14 +1571,14 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
         # heights = [(1 + 0.5)/2, (0.5 + 0)/2] = [0.75, 0.25]
         # widths = [(1 - 0), (0 - 0)] = [1, 0]
         expected_result = 0.75 * 1 + 0.25 * 0
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+        _assert_all_close(self, result, expected_result)
 
     def test_unweighted_from_logits(self):
         self.setup()
         auc_obj = metrics.AUC(
             num_thresholds=self.num_thresholds, from_logits=True
         )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
         result = auc_obj(self.y_true, self.y_pred_logits)
 
         # tp = [2, 1, 0], fp = [2, 0, 0], fn = [0, 1, 2], tn = [0, 2, 2]
@@ -1470,7 +1587,7 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
         # heights = [(1 + 0.5)/2, (0.5 + 0)/2] = [0.75, 0.25]
         # widths = [(1 - 0), (0 - 0)] = [1, 0]
         expected_result = 0.75 * 1 + 0.25 * 0
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+        _assert_all_close(self, result, expected_result)
 
     def test_manual_thresholds(self):
         self.setup()
@@ -1479,7 +1596,7 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
         auc_obj = metrics.AUC(num_thresholds=2, thresholds=[0.5])
         self.assertEqual(auc_obj.num_thresholds, 3)
         self.assertAllClose(auc_obj.thresholds, [0.0, 0.5, 1.0])
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
         result = auc_obj(self.y_true, self.y_pred)
 
         # tp = [2, 1, 0], fp = [2, 0, 0], fn = [0, 1, 2], tn = [0, 2, 2]
@@ -1488,111 +1605,30 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
         # heights = [(1 + 0.5)/2, (0.5 + 0)/2] = [0.75, 0.25]
         # widths = [(1 - 0), (0 - 0)] = [1, 0]
         expected_result = 0.75 * 1 + 0.25 * 0
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
-
-    def test_weighted_roc_interpolation(self):
-        self.setup()
-        auc_obj = metrics.AUC(num_thresholds=self.num_thresholds)
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
-        result = auc_obj(
-            self.y_true, self.y_pred, sample_weight=self.sample_weight
-        )
-
-        # tp = [7, 4, 0], fp = [3, 0, 0], fn = [0, 3, 7], tn = [0, 3, 3]
-        # recall = [7/7, 4/(4+3), 0] = [1, 0.571, 0]
-        # fp_rate = [3/3, 0, 0] = [1, 0, 0]
+        _assert_all_close(self, result, expected_result)
+
+    # All weighted cases use tp = [7, 4, 0], fp = [3, 0, 0], fn = [0, 3, 7],
+    # tn = [0, 3, 3], which gives:
+    # precision = [7/(7+3), 4/4, 0] = [0.7, 1, 0]
+    # recall = [7/7, 4/(4+3), 0] = [1, 0.571, 0]
+    # fp_rate = [3/3, 0, 0] = [1, 0, 0]
+    @parameterized.named_parameters(
         # heights = [(1 + 0.571)/2, (0.571 + 0)/2] = [0.7855, 0.2855]
         # widths = [(1 - 0), (0 - 0)] = [1, 0]
-        expected_result = 0.7855 * 1 + 0.2855 * 0
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
-
-    def test_weighted_roc_majoring(self):
-        self.setup()
-        auc_obj = metrics.AUC(
-            num_thresholds=self.num_thresholds, summation_method="majoring"
-        )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
-        result = auc_obj(
-            self.y_true, self.y_pred, sample_weight=self.sample_weight
-        )
-
-        # tp = [7, 4, 0], fp = [3, 0, 0], fn = [0, 3, 7], tn = [0, 3, 3]
-        # recall = [7/7, 4/(4+3), 0] = [1, 0.571, 0]
-        # fp_rate = [3/3, 0, 0] = [1, 0, 0]
+        ("roc_interpolation", "ROC", "interpolation", 0.7855 * 1 + 0.2855 * 0),
         # heights = [max(1, 0.571), max(0.571, 0)] = [1, 0.571]
         # widths = [(1 - 0), (0 - 0)] = [1, 0]
-        expected_result = 1 * 1 + 0.571 * 0
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
-
-    def test_weighted_roc_minoring(self):
-        self.setup()
-        auc_obj = metrics.AUC(
-            num_thresholds=self.num_thresholds, summation_method="minoring"
-        )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
-        result = auc_obj(
-            self.y_true, self.y_pred, sample_weight=self.sample_weight
-        )
-
-        # tp = [7, 4, 0], fp = [3, 0, 0], fn = [0, 3, 7], tn = [0, 3, 3]
-        # recall = [7/7, 4/(4+3), 0] = [1, 0.571, 0]
-        # fp_rate = [3/3, 0, 0] = [1, 0, 0]
+        ("roc_majoring", "ROC", "majoring", 1 * 1 + 0.571 * 0),
         # heights = [min(1, 0.571), min(0.571, 0)] = [0.571, 0]
         # widths = [(1 - 0), (0 - 0)] = [1, 0]
-        expected_result = 0.571 * 1 + 0 * 0
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
-
-    def test_weighted_pr_majoring(self):
-        self.setup()
-        auc_obj = metrics.AUC(
-            num_thresholds=self.num_thresholds,
-            curve="PR",
-            summation_method="majoring",
-        )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
-        result = auc_obj(
-            self.y_true, self.y_pred, sample_weight=self.sample_weight
-        )
-
-        # tp = [7, 4, 0], fp = [3, 0, 0], fn = [0, 3, 7], tn = [0, 3, 3]
-        # precision = [7/(7+3), 4/4, 0] = [0.7, 1, 0]
-        # recall = [7/7, 4/(4+3), 0] = [1, 0.571, 0]
+        ("roc_minoring", "ROC", "minoring", 0.571 * 1 + 0 * 0),
         # heights = [max(0.7, 1), max(1, 0)] = [1, 1]
         # widths = [(1 - 0.571), (0.571 - 0)] = [0.429, 0.571]
-        expected_result = 1 * 0.429 + 1 * 0.571
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
-
-    def test_weighted_pr_minoring(self):
-        self.setup()
-        auc_obj = metrics.AUC(
-            num_thresholds=self.num_thresholds,
-            curve="PR",
-            summation_method="minoring",
-        )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
-        result = auc_obj(
-            self.y_true, self.y_pred, sample_weight=self.sample_weight
-        )
-
-        # tp = [7, 4, 0], fp = [3, 0, 0], fn = [0, 3, 7], tn = [0, 3, 3]
-        # precision = [7/(7+3), 4/4, 0] = [0.7, 1, 0]
-        # recall = [7/7, 4/(4+3), 0] = [1, 0.571, 0]
+        ("pr_majoring", "PR", "majoring", 1 * 0.429 + 1 * 0.571),
         # heights = [min(0.7, 1), min(1, 0)] = [0.7, 0]
         # widths = [(1 - 0.571), (0.571 - 0)] = [0.429, 0.571]
-        expected_result = 0.7 * 0.429 + 0 * 0.571
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
-
-    def test_weighted_pr_interpolation(self):
-        self.setup()
-        auc_obj = metrics.AUC(num_thresholds=self.num_thresholds, curve="PR")
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
-        result = auc_obj(
-            self.y_true, self.y_pred, sample_weight=self.sample_weight
-        )
-
+        ("pr_minoring", "PR", "minoring", 0.7 * 0.429 + 0 * 0.571),
         # auc = (slope / Total Pos) * [dTP - intercept * log(Pb/Pa)]
-
-        # tp = [7, 4, 0], fp = [3, 0, 0], fn = [0, 3, 7], tn = [0, 3, 3]
         # P = tp + fp = [10, 4, 0]
         # dTP = [7-4, 4-0] = [3, 4]
         # dP = [10-4, 4-0] = [6, 4]
@@ -1602,8 +1638,20 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
         # auc * TotalPos = [(0.5 * (3 + 2 * log(2.5))), (1 * (4 + 0))]
         #                = [2.416, 4]
         # auc = [2.416, 4]/(tp[1:]+fn[1:])
-        expected_result = 2.416 / 7 + 4 / 7
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+        ("pr_interpolation", "PR", "interpolation", 2.416 / 7 + 4 / 7),
+    )
+    def test_weighted(self, curve, summation_method, expected_result):
+        self.setup()
+        auc_obj = metrics.AUC(
+            num_thresholds=self.num_thresholds,
+            curve=curve,
+            summation_method=summation_method,
+        )
+        _initialize_variables(self, auc_obj)
+        result = auc_obj(
+            self.y_true, self.y_pred, sample_weight=self.sample_weight
+        )
+        _assert_all_close(self, result, expected_result)
 
     def test_invalid_num_thresholds(self):
         with self.assertRaisesRegex(
@@ -1629,45 +1677,29 @@ class AUCTest(tf.test.TestCase, parameterized.TestCase):
             metrics.AUC(summation_method="Invalid")
 
     def test_extra_dims(self):
-        try:
-            from scipy import special
-
-            self.setup()
-            logits = special.expit(
-                -np.array(
-                    [
-                        [[-10.0, 10.0, -10.0], [10.0, -10.0, 10.0]],
-                        [[-12.0, 12.0, -12.0], [12.0, -12.0, 12.0]],
-                    ],
-                    dtype=np.float32,
-                )
-            )
-            labels = np.array(
-                [[[1, 0, 0], [1, 0, 0]], [[0, 1, 1], [0, 1, 1]]], dtype=np.int64
-            )
-            auc_obj = metrics.AUC()
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
-            result = auc_obj(labels, logits)
-            self.assertEqual(self.evaluate(result), 0.5)
-        except ImportError as e:
-            tf_logging.warning(f"Cannot test special functions: {str(e)}")
+        if special is None:
+            self.skipTest("scipy is not available.")
+        auc_obj = metrics.AUC()
+        _initialize_variables(self, auc_obj)
+        result = auc_obj(_EXTRA_DIMS_LABELS, _EXTRA_DIMS_LOGITS)
+        self.assertEqual(self.evaluate(result), 0.5)
 
 
 @test_combinations.generate(test_combinations.combine(mode=["graph", "eager"]))
 class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
-    def setup(self):
-        self.num_thresholds = 5
-        self.y_pred = tf.constant(
-            np.array([[0, 0.5, 0.3, 0.9], [0.1, 0.2, 0.3, 0.4]]).T,
-            dtype=tf.float32,
-        )
-
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.num_thresholds = 5
+        cls._y_pred = np.array(
+            [[0, 0.5, 0.3, 0.9], [0.1, 0.2, 0.3, 0.4]], dtype=np.float32
+        ).T
         epsilon = 1e-12
-        self.y_pred_logits = -tf.math.log(1.0 / (self.y_pred + epsilon) - 1.0)
-
-        self.y_true_good = tf.constant(np.array([[0, 0, 1, 1], [0, 0, 1, 1]]).T)
-        self.y_true_bad = tf.constant(np.array([[0, 0, 1, 1], [1, 1, 0, 0]]).T)
-        self.sample_weight = [1, 2, 3, 4]
+        cls._y_pred_logits = -np.log(1.0 / (cls._y_pred + epsilon) - 1.0)
+        cls._y_true_good, cls._y_true_bad = np.array(
+            [[[0, 0, 1, 1], [0, 0, 1, 1]], [[0, 0, 1, 1], [1, 1, 0, 0]]]
+        ).transpose(0, 2, 1)
+        cls.sample_weight = np.array([1, 2, 3, 4], dtype=np.float32)
 
         # threshold values are [0 - 1e-7, 0.25, 0.5, 0.75, 1 + 1e-7]
         # y_pred when threshold = 0 - 1e-7   : [[1, 1, 1, 1], [1, 1, 1, 1]]
@@ -1704,11 +1736,19 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
         # tpr = [[1, 1,    0.57, 0.57, 0], [1, 1, 0, 0, 0]]
         # fpr = [[1, 0.67, 0,    0,    0], [1, 0, 0, 0, 0]]
 
+    def setup(self):
+        # Tensors are built inside each test so that they belong to the
+        # graph of the graph-mode runs.
+        self.y_pred = tf.constant(self._y_pred)
+        self.y_pred_logits = tf.constant(self._y_pred_logits)
+        self.y_true_good = tf.constant(self._y_true_good)
+        self.y_true_bad = tf.constant(self._y_true_bad)
+
     def test_value_is_idempotent(self):
         with self.test_session():
             self.setup()
             auc_obj = metrics.AUC(num_thresholds=5, multi_label=True)
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
 
             # Run several updates.
             update_op = auc_obj.update_state(self.y_true_good, self.y_pred)
@@ -1726,14 +1766,14 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
         with self.test_session():
             self.setup()
             auc_obj = metrics.AUC(multi_label=True)
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
             result = auc_obj(self.y_true_good, self.y_true_good)
             self.assertEqual(self.evaluate(result), 1)
 
     def test_unweighted_all_correct_flat(self):
         self.setup()
         auc_obj = metrics.AUC(multi_label=False)
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
         result = auc_obj(self.y_true_good, self.y_true_good)
         self.assertEqual(self.evaluate(result), 1)
 
@@ -1743,13 +1783,13 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             auc_obj = metrics.AUC(
                 num_thresholds=self.num_thresholds, multi_label=True
             )
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
             result = auc_obj(self.y_true_good, self.y_pred)
 
             # tpr = [[1, 1, 0.5, 0.5, 0], [1, 1, 0, 0, 0]]
             # fpr = [[1, 0.5, 0, 0, 0], [1, 0, 0, 0, 0]]
             expected_result = (0.875 + 1.0) / 2.0
-            self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+            _assert_all_close(self, result, expected_result)
 
     def test_unweighted_from_logits(self):
         with self.test_session():
@@ -1759,43 +1799,43 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
                 multi_label=True,
                 from_logits=True,
             )
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
             result = auc_obj(self.y_true_good, self.y_pred_logits)
 
             # tpr = [[1, 1, 0.5, 0.5, 0], [1, 1, 0, 0, 0]]
             # fpr = [[1, 0.5, 0, 0, 0], [1, 0, 0, 0, 0]]
             expected_result = (0.875 + 1.0) / 2.0
-            self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+            _assert_all_close(self, result, expected_result)
 
     def test_sample_weight_flat(self):
         self.setup()
         auc_obj = metrics.AUC(
             num_thresholds=self.num_thresholds, multi_label=False
         )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
         result = auc_obj(
-            self.y_true_good, self.y_pred, sample_weight=[1, 2, 3, 4]
+            self.y_true_good, self.y_pred, sample_weight=self.sample_weight
         )
 
         # tpr = [1, 1, 0.2857, 0.2857, 0]
         # fpr = [1, 0.3333, 0, 0, 0]
         expected_result = 1.0 - (0.3333 * (1.0 - 0.2857) / 2.0)
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+        _assert_all_close(self, result, expected_result)
 
     def test_full_sample_weight_flat(self):
         self.setup()
         auc_obj = metrics.AUC(
             num_thresholds=self.num_thresholds, multi_label=False
         )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
-        sw = np.arange(4 * 2)
-        sw = sw.reshape(4, 2)
-        result = auc_obj(self.y_true_good, self.y_pred, sample_weight=sw)
+        _initialize_variables(self, auc_obj)
+        result = auc_obj(
+            self.y_true_good, self.y_pred, sample_weight=_FULL_SAMPLE_WEIGHT
+        )
 
         # tpr = [1, 1, 0.2727, 0.2727, 0]
         # fpr = [1, 0.3333, 0, 0, 0]
         expected_result = 1.0 - (0.3333 * (1.0 - 0.2727) / 2.0)
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+        _assert_all_close(self, result, expected_result)
 
     def test_label_weights(self):
         with self.test_session():
@@ -1805,13 +1845,13 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
                 multi_label=True,
                 label_weights=[0.75, 0.25],
             )
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
             result = auc_obj(self.y_true_good, self.y_pred)
 
             # tpr = [[1, 1, 0.5, 0.5, 0], [1, 1, 0, 0, 0]]
             # fpr = [[1, 0.5, 0, 0, 0], [1, 0, 0, 0, 0]]
             expected_result = (0.875 * 0.75 + 1.0 * 0.25) / (0.75 + 0.25)
-            self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+            _assert_all_close(self, result, expected_result)
 
     def test_label_weights_flat(self):
         self.setup()
@@ -1820,20 +1860,20 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             multi_label=False,
             label_weights=[0.75, 0.25],
         )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
         result = auc_obj(self.y_true_good, self.y_pred)
 
         # tpr = [1, 1, 0.375, 0.375, 0]
         # fpr = [1, 0.375, 0, 0, 0]
         expected_result = 1.0 - ((1.0 - 0.375) * 0.375 / 2.0)
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-2)
+        _assert_all_close(self, result, expected_result, 1e-2)
 
     def test_unweighted_flat(self):
         self.setup()
         auc_obj = metrics.AUC(
             num_thresholds=self.num_thresholds, multi_label=False
         )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
         result = auc_obj(self.y_true_good, self.y_pred)
 
         # tp = [4, 4, 1, 1, 0]
@@ -1844,7 +1884,7 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
         # tpr = [1, 1, 0.25, 0.25, 0]
         # fpr = [1, 0.25, 0, 0, 0]
         expected_result = 1.0 - (3.0 / 32.0)
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+        _assert_all_close(self, result, expected_result)
 
     def test_unweighted_flat_from_logits(self):
         self.setup()
@@ -1853,7 +1893,7 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             multi_label=False,
             from_logits=True,
         )
-        self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+        _initialize_variables(self, auc_obj)
         result = auc_obj(self.y_true_good, self.y_pred_logits)
 
         # tp = [4, 4, 1, 1, 0]
@@ -1864,7 +1904,7 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
         # tpr = [1, 1, 0.25, 0.25, 0]
         # fpr = [1, 0.25, 0, 0, 0]
         expected_result = 1.0 - (3.0 / 32.0)
-        self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+        _assert_all_close(self, result, expected_result)
 
     def test_manual_thresholds(self):
         with self.test_session():
@@ -1876,7 +1916,7 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             )
             self.assertEqual(auc_obj.num_thresholds, 3)
             self.assertAllClose(auc_obj.thresholds, [0.0, 0.5, 1.0])
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
             result = auc_obj(self.y_true_good, self.y_pred)
 
             # tp = [[2, 1, 0], [2, 0, 0]]
@@ -1890,7 +1930,7 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             # auc by slice = [0.75, 0.5]
             expected_result = (0.75 + 0.5) / 2.0
 
-            self.assertAllClose(self.evaluate(result), expected_result, 1e-3)
+            _assert_all_close(self, result, expected_result)
 
     def test_weighted_roc_interpolation(self):
         with self.test_session():
@@ -1898,7 +1938,7 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             auc_obj = metrics.AUC(
                 num_thresholds=self.num_thresholds, multi_label=True
             )
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
             result = auc_obj(
                 self.y_true_good, self.y_pred, sample_weight=self.sample_weight
             )
@@ -1906,7 +1946,7 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             # tpr = [[1, 1,    0.57, 0.57, 0], [1, 1, 0, 0, 0]]
             # fpr = [[1, 0.67, 0,    0,    0], [1, 0, 0, 0, 0]]
             expected_result = 1.0 - 0.5 * 0.43 * 0.67
-            self.assertAllClose(self.evaluate(result), expected_result, 1e-1)
+            _assert_all_close(self, result, expected_result, 1e-1)
 
     def test_pr_interpolation_unweighted(self):
         with self.test_session():
@@ -1914,19 +1954,17 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             auc_obj = metrics.AUC(
                 num_thresholds=self.num_thresholds, curve="PR", multi_label=True
             )
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
             good_result = auc_obj(self.y_true_good, self.y_pred)
             with self.subTest(name="good"):
                 # PR AUCs are 0.917 and 1.0 respectively
-                self.assertAllClose(
-                    self.evaluate(good_result), (0.91667 + 1.0) / 2.0, 1e-1
+                _assert_all_close(
+                    self, good_result, (0.91667 + 1.0) / 2.0, 1e-1
                 )
             bad_result = auc_obj(self.y_true_bad, self.y_pred)
             with self.subTest(name="bad"):
                 # PR AUCs are 0.917 and 0.5 respectively
-                self.assertAllClose(
-                    self.evaluate(bad_result), (0.91667 + 0.5) / 2.0, 1e-1
-                )
+                _assert_all_close(self, bad_result, (0.91667 + 0.5) / 2.0, 1e-1)
 
     def test_pr_interpolation(self):
         with self.test_session():
@@ -1934,14 +1972,12 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             auc_obj = metrics.AUC(
                 num_thresholds=self.num_thresholds, curve="PR", multi_label=True
             )
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
             good_result = auc_obj(
                 self.y_true_good, self.y_pred, sample_weight=self.sample_weight
             )
             # PR AUCs are 0.939 and 1.0 respectively
-            self.assertAllClose(
-                self.evaluate(good_result), (0.939 + 1.0) / 2.0, 1e-1
-            )
+            _assert_all_close(self, good_result, (0.939 + 1.0) / 2.0, 1e-1)
 
     def test_keras_model_compiles(self):
         inputs = layers.Input(shape=(10,))
@@ -1957,7 +1993,7 @@ class MultiAUCTest(tf.test.TestCase, parameterized.TestCase):
             auc_obj = metrics.AUC(
                 num_thresholds=self.num_thresholds, multi_label=True
             )
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
+            _initialize_variables(self, auc_obj)
             auc_obj(self.y_true_good, self.y_pred)
             auc_obj.reset_state()
             self.assertAllEqual(auc_obj.true_positives, np.zeros((5, 2)))
@@ -2041,21 +2077,19 @@ class ThresholdsTest(tf.test.TestCase, parameterized.TestCase):
         with tf.compat.forward_compatibility_horizon(2021, 6, 9):
             # make sure the old approach and new approach produce same result
             # for evenly distributed thresholds
-            y_true = np.random.randint(2, size=(10,))
-            y_pred = np.random.rand(10)
+            rng = np.random.default_rng(1337)
+            y_true = rng.integers(2, size=(10,), dtype=np.int64)
+            y_pred = rng.random(10, dtype=np.float64)
 
             even_thresholds = [0.0, 0.25, 0.5, 0.75, 1.0]
             if metric_cls == metrics.AUC:
                 even_thresholds = even_thresholds[1:-1]
             metric_obj = metric_cls(thresholds=even_thresholds)
-            metric_obj.update_state(y_true, y_pred)
-            result1 = metric_obj.result()
-
             metric_obj2 = metric_cls(thresholds=even_thresholds)
             # Force to use the old approach
             metric_obj2._thresholds_distributed_evenly = False
-            metric_obj2.update_state(y_true, y_pred)
-            result2 = metric_obj2.result()
+            update_and_result = _update_and_result_fn(metric_obj, metric_obj2)
+            result1, result2 = update_and_result(y_true, y_pred)
 
             self.assertAllClose(result1, result2)
             # Check all the variables are the same, eg tp, tn, fp, fn
@@ -2072,18 +2106,16 @@ class ThresholdsTest(tf.test.TestCase, parameterized.TestCase):
     )
     def test_even_thresholds_correctness_2(self, metric_cls):
         with tf.compat.forward_compatibility_horizon(2021, 6, 9):
-            y_true = np.random.randint(2, size=(10,))
-            y_pred = np.random.rand(10)
+            rng = np.random.default_rng(1337)
+            y_true = rng.integers(2, size=(10,), dtype=np.int64)
+            y_pred = rng.random(10, dtype=np.float64)
 
             metric_obj = metric_cls(0.5)
-            metric_obj.update_state(y_true, y_pred)
-            result1 = metric_obj.result()
-
             metric_obj2 = metric_cls(0.5)
             # Force to use the old approach
             metric_obj2._thresholds_distributed_evenly = False
-            metric_obj2.update_state(y_true, y_pred)
-            result2 = metric_obj2.result()
+            update_and_result = _update_and_result_fn(metric_obj, metric_obj2)
+            result1, result2 = update_and_result(y_true, y_pred)
 
             self.assertAllClose(result1, result2)
             # Check all the variables are the same, eg tp, tn, fp, fn
@@ -2114,29 +2146,6 @@ class BinaryTruePositives(metrics.Metric):
         return self.true_positives
 
 
-class BinaryTruePositivesViaControlFlow(metrics.Metric):
-    def __init__(self, name="binary_true_positives", **kwargs):
-        super().__init__(name=name, **kwargs)
-        self.true_positives = self.add_weight(name="tp", initializer="zeros")
-
-    def update_state(self, y_true, y_pred, sample_weight=None):
-        y_true = tf.cast(y_true, tf.bool)
-        y_pred = tf.cast(y_pred, tf.bool)
-
-        for i in range(len(y_true)):
-            for j in range(len(y_true[i])):
-                if y_true[i][j] and y_pred[i][j]:
-                    if sample_weight is None:
-                        self.true_positives.assign_add(1)
-                    else:
-                        self.true_positives.assign_add(sample_weight[i][0])
-
-    def result(self):
-        if tf.constant(True):
-            return self.true_positives
-        return 0.0
-
-
 def _get_model(compile_metrics):
     model_layers = [
         layers.Dense(3, activation="relu", kernel_initializer="ones"),
@@ -2156,57 +2165,97 @@ def _get_model(compile_metrics):
 @test_combinations.run_with_all_model_types
 @test_combinations.run_all_keras_modes
 class ResetStatesTest(test_combinations.TestCase):
-    def test_reset_state_false_positives(self):
-        fp_obj = metrics.FalsePositives()
-        model = _get_model([fp_obj])
-        x = np.ones((100, 4))
-        y = np.zeros((100, 1))
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(fp_obj.accumulator), 100.0)
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(fp_obj.accumulator), 100.0)
-
-    def test_reset_state_false_negatives(self):
-        fn_obj = metrics.FalseNegatives()
-        model = _get_model([fn_obj])
-        x = np.zeros((100, 4))
-        y = np.ones((100, 1))
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(fn_obj.accumulator), 100.0)
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(fn_obj.accumulator), 100.0)
-
-    def test_reset_state_true_negatives(self):
-        tn_obj = metrics.TrueNegatives()
-        model = _get_model([tn_obj])
-        x = np.zeros((100, 4))
-        y = np.zeros((100, 1))
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(tn_obj.accumulator), 100.0)
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(tn_obj.accumulator), 100.0)
-
-    def test_reset_state_true_positives(self):
-        tp_obj = metrics.TruePositives()
-        model = _get_model([tp_obj])
-        x = np.ones((100, 4))
-        y = np.ones((100, 1))
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(tp_obj.accumulator), 100.0)
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(tp_obj.accumulator), 100.0)
-
-    def test_reset_state_precision(self):
-        p_obj = metrics.Precision()
-        model = _get_model([p_obj])
-        x = np.concatenate((np.ones((50, 4)), np.ones((50, 4))))
-        y = np.concatenate((np.ones((50, 1)), np.zeros((50, 1))))
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(p_obj.true_positives), 50.0)
-        self.assertEqual(self.evaluate(p_obj.false_positives), 50.0)
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(p_obj.true_positives), 50.0)
-        self.assertEqual(self.evaluate(p_obj.false_positives), 50.0)
+    @parameterized.named_parameters(
+        (
+            "false_positives",
+            metrics.FalsePositives,
+            _ONES_X,
+            _ZEROS_Y,
+            {"accumulator": 100.0},
+        ),
+        (
+            "false_negatives",
+            metrics.FalseNegatives,
+            _ZEROS_X,
+            _ONES_Y,
+            {"accumulator": 100.0},
+        ),
+        (
+            "true_negatives",
+            metrics.TrueNegatives,
+            _ZEROS_X,
+            _ZEROS_Y,
+            {"accumulator": 100.0},
+        ),
+        (
+            "true_positives",
+            metrics.TruePositives,
+            _ONES_X,
+            _ONES_Y,
+            {"accumulator": 100.0},
+        ),
+        (
+            "precision",
+            metrics.Precision,
+            _ONES_X,
+            _blocks([1, 0], rows=50, cols=1),
+            {"true_positives": 50.0, "false_positives": 50.0},
+        ),
+        (
+            "recall",
+            metrics.Recall,
+            _blocks([1, 0], rows=50),
+            _ONES_Y,
+            {"true_positives": 50.0, "false_negatives": 50.0},
+        ),
+        (
+            "sensitivity_at_specificity",
+            functools.partial(
+                metrics.SensitivityAtSpecificity, 0.5, num_thresholds=1
+            ),
+            _X_ALT,
+            _Y_ALT,
+            _X_ALT_COUNTS,
+        ),
+        (
+            "specificity_at_sensitivity",
+            functools.partial(
+                metrics.SpecificityAtSensitivity, 0.5, num_thresholds=1
+            ),
+            _X_ALT,
+            _Y_ALT,
+            _X_ALT_COUNTS,
+        ),
+        (
+            "precision_at_recall",
+            functools.partial(
+                metrics.PrecisionAtRecall, recall=0.5, num_thresholds=1
+            ),
+            _X_ALT,
+            _Y_ALT,
+            _X_ALT_COUNTS,
+        ),
+        (
+            "recall_at_precision",
+            functools.partial(
+                metrics.RecallAtPrecision, precision=0.5, num_thresholds=1
+            ),
+            _X_ALT,
+            _Y_ALT,
+            _X_ALT_COUNTS,
+        ),
+    )
+    def test_reset_state(self, metric_fn, x, y, expected_counts):
+        metric_obj = metric_fn()
+        model = _get_model([metric_obj])
+        x = tf.constant(x)
+        y = tf.constant(y)
+        for _ in range(2):
+            model.evaluate(x, y)
+            counts = self.evaluate(
+                {name: getattr(metric_obj, name) for name in expected_counts}
+            )
+            self.assertEqual(counts, expected_counts)
 
     def test_precision_update_state_with_logits(self):
         p_obj = metrics.Precision()
@@ -2214,152 +2263,25 @@ class ResetStatesTest(test_combinations.TestCase):
         # error.
         p_obj.update_state([-0.5, 0.5], [-2.0, 2.0])
 
-    def test_reset_state_recall(self):
-        r_obj = metrics.Recall()
-        model = _get_model([r_obj])
-        x = np.concatenate((np.ones((50, 4)), np.zeros((50, 4))))
-        y = np.concatenate((np.ones((50, 1)), np.ones((50, 1))))
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(r_obj.true_positives), 50.0)
-        self.assertEqual(self.evaluate(r_obj.false_negatives), 50.0)
-        model.evaluate(x, y)
-        self.assertEqual(self.evaluate(r_obj.true_positives), 50.0)
-        self.assertEqual(self.evaluate(r_obj.false_negatives), 50.0)
-
-    def test_reset_state_sensitivity_at_specificity(self):
-        s_obj = metrics.SensitivityAtSpecificity(0.5, num_thresholds=1)
-        model = _get_model([s_obj])
-        x = np.concatenate(
-            (
-                np.ones((25, 4)),
-                np.zeros((25, 4)),
-                np.zeros((25, 4)),
-                np.ones((25, 4)),
-            )
-        )
-        y = np.concatenate(
-            (
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-            )
-        )
-
-        for _ in range(2):
-            model.evaluate(x, y)
-            self.assertEqual(self.evaluate(s_obj.true_positives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.false_positives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.false_negatives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.true_negatives), 25.0)
-
-    def test_reset_state_specificity_at_sensitivity(self):
-        s_obj = metrics.SpecificityAtSensitivity(0.5, num_thresholds=1)
-        model = _get_model([s_obj])
-        x = np.concatenate(
-            (
-                np.ones((25, 4)),
-                np.zeros((25, 4)),
-                np.zeros((25, 4)),
-                np.ones((25, 4)),
-            )
-        )
-        y = np.concatenate(
-            (
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-            )
-        )
-
-        for _ in range(2):
-            model.evaluate(x, y)
-            self.assertEqual(self.evaluate(s_obj.true_positives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.false_positives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.false_negatives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.true_negatives), 25.0)
-
-    def test_reset_state_precision_at_recall(self):
-        s_obj = metrics.PrecisionAtRecall(recall=0.5, num_thresholds=1)
-        model = _get_model([s_obj])
-        x = np.concatenate(
-            (
-                np.ones((25, 4)),
-                np.zeros((25, 4)),
-                np.zeros((25, 4)),
-                np.ones((25, 4)),
-            )
-        )
-        y = np.concatenate(
-            (
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-            )
-        )
-
-        for _ in range(2):
-            model.evaluate(x, y)
-            self.assertEqual(self.evaluate(s_obj.true_positives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.false_positives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.false_negatives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.true_negatives), 25.0)
-
-    def test_reset_state_recall_at_precision(self):
-        s_obj = metrics.RecallAtPrecision(precision=0.5, num_thresholds=1)
-        model = _get_model([s_obj])
-        x = np.concatenate(
-            (
-                np.ones((25, 4)),
-                np.zeros((25, 4)),
-                np.zeros((25, 4)),
-                np.ones((25, 4)),
-            )
-        )
-        y = np.concatenate(
-            (
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-            )
-        )
-
-        for _ in range(2):
-            model.evaluate(x, y)
-            self.assertEqual(self.evaluate(s_obj.true_positives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.false_positives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.false_negatives), 25.0)
-            self.assertEqual(self.evaluate(s_obj.true_negatives), 25.0)
-
     def test_reset_state_auc(self):
         auc_obj = metrics.AUC(num_thresholds=3)
         model = _get_model([auc_obj])
-        x = np.concatenate(
-            (
-                np.ones((25, 4)),
-                np.zeros((25, 4)),
-                np.zeros((25, 4)),
-                np.ones((25, 4)),
-            )
-        )
-        y = np.concatenate(
-            (
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-            )
-        )
-
+        x = tf.constant(_X_ALT)
+        y = tf.constant(_Y_ALT)
         for _ in range(2):
             model.evaluate(x, y)
-            self.assertEqual(self.evaluate(auc_obj.true_positives[1]), 25.0)
-            self.assertEqual(self.evaluate(auc_obj.false_positives[1]), 25.0)
-            self.assertEqual(self.evaluate(auc_obj.false_negatives[1]), 25.0)
-            self.assertEqual(self.evaluate(auc_obj.true_negatives[1]), 25.0)
+            tp, fp, fn, tn = self.evaluate(
+                [
+                    auc_obj.true_positives,
+                    auc_obj.false_positives,
+                    auc_obj.false_negatives,
+                    auc_obj.true_negatives,
+                ]
+            )
+            self.assertEqual(tp[1], 25.0)
+            self.assertEqual(fp[1], 25.0)
+            self.assertEqual(fn[1], 25.0)
+            self.assertEqual(tn[1], 25.0)
 
     def test_reset_state_auc_from_logits(self):
         auc_obj = metrics.AUC(num_thresholds=3, from_logits=True)
@@ -2375,71 +2297,57 @@ class ResetStatesTest(test_combinations.TestCase):
             run_eagerly=test_utils.should_run_eagerly(),
         )
 
-        x = np.concatenate(
-            (
-                np.ones((25, 4)),
-                -np.ones((25, 4)),
-                -np.ones((25, 4)),
-                np.ones((25, 4)),
-            )
-        )
-        y = np.concatenate(
-            (
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-            )
-        )
+        x = tf.constant(_blocks([1, -1, -1, 1]))
+        y = tf.constant(_Y_ALT)
 
         for _ in range(2):
             model.evaluate(x, y)
-            self.assertEqual(self.evaluate(auc_obj.true_positives[1]), 25.0)
-            self.assertEqual(self.evaluate(auc_obj.false_positives[1]), 25.0)
-            self.assertEqual(self.evaluate(auc_obj.false_negatives[1]), 25.0)
-            self.assertEqual(self.evaluate(auc_obj.true_negatives[1]), 25.0)
+            tp, fp, fn, tn = self.evaluate(
+                [
+                    auc_obj.true_positives,
+                    auc_obj.false_positives,
+                    auc_obj.false_negatives,
+                    auc_obj.true_negatives,
+                ]
+            )
+            self.assertEqual(tp[1], 25.0)
+            self.assertEqual(fp[1], 25.0)
+            self.assertEqual(fn[1], 25.0)
+            self.assertEqual(tn[1], 25.0)
 
     def test_reset_state_auc_manual_thresholds(self):
         auc_obj = metrics.AUC(thresholds=[0.5])
         model = _get_model([auc_obj])
-        x = np.concatenate(
-            (
-                np.ones((25, 4)),
-                np.zeros((25, 4)),
-                np.zeros((25, 4)),
-                np.ones((25, 4)),
-            )
-        )
-        y = np.concatenate(
-            (
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-                np.ones((25, 1)),
-                np.zeros((25, 1)),
-            )
-        )
-
+        x = tf.constant(_X_ALT)
+        y = tf.constant(_Y_ALT)
         for _ in range(2):
             model.evaluate(x, y)
-            self.assertEqual(self.evaluate(auc_obj.true_positives[1]), 25.0)
-            self.assertEqual(self.evaluate(auc_obj.false_positives[1]), 25.0)
-            self.assertEqual(self.evaluate(auc_obj.false_negatives[1]), 25.0)
-            self.assertEqual(self.evaluate(auc_obj.true_negatives[1]), 25.0)
+            tp, fp, fn, tn = self.evaluate(
+                [
+                    auc_obj.true_positives,
+                    auc_obj.false_positives,
+                    auc_obj.false_negatives,
+                    auc_obj.true_negatives,
+                ]
+            )
+            self.assertEqual(tp[1], 25.0)
+            self.assertEqual(fp[1], 25.0)
+            self.assertEqual(fn[1], 25.0)
+            self.assertEqual(tn[1], 25.0)
 
     def test_reset_state_mean_iou(self):
         m_obj = metrics.MeanIoU(num_classes=2)
         model = _get_model([m_obj])
-        x = np.asarray(
-            [[0, 0, 0, 0], [1, 1, 1, 1], [1, 0, 1, 0], [0, 1, 0, 1]],
-            dtype=np.float32,
-        )
-        y = np.asarray([[0], [1], [1], [1]], dtype=np.float32)
+        x = tf.constant(_MIOU_X)
+        y = tf.constant(_MIOU_Y)
         model.evaluate(x, y)
-        self.assertArrayNear(self.evaluate(m_obj.total_cm)[0], [1, 0], 1e-1)
-        self.assertArrayNear(self.evaluate(m_obj.total_cm)[1], [3, 0], 1e-1)
+        total_cm = self.evaluate(m_obj.total_cm)
+        self.assertArrayNear(total_cm[0], [1, 0], 1e-1)
+        self.assertArrayNear(total_cm[1], [3, 0], 1e-1)
         model.evaluate(x, y)
-        self.assertArrayNear(self.evaluate(m_obj.total_cm)[0], [1, 0], 1e-1)
-        self.assertArrayNear(self.evaluate(m_obj.total_cm)[1], [3, 0], 1e-1)
+        total_cm = self.evaluate(m_obj.total_cm)
+        self.assertArrayNear(total_cm[0], [1, 0], 1e-1)
+        self.assertArrayNear(total_cm[1], [3, 0], 1e-1)
 
     def test_reset_state_recall_float64(self):
         # Test case for GitHub issue 36790.
@@ -2447,14 +2355,20 @@ class ResetStatesTest(test_combinations.TestCase):
             backend.set_floatx("float64")
             r_obj = metrics.Recall()
             model = _get_model([r_obj])
-            x = np.concatenate((np.ones((50, 4)), np.zeros((50, 4))))
-            y = np.concatenate((np.ones((50, 1)), np.ones((50, 1))))
+            x = tf.constant(_blocks([1, 0], rows=50), dtype=tf.float64)
+            y = tf.constant(_ONES_Y, dtype=tf.float64)
             model.evaluate(x, y)
-            self.assertEqual(self.evaluate(r_obj.true_positives), 50.0)
-            self.assertEqual(self.evaluate(r_obj.false_negatives), 50.0)
+            tp, fn = self.evaluate(
+                [r_obj.true_positives, r_obj.false_negatives]
+            )
+            self.assertEqual(tp, 50.0)
+            self.assertEqual(fn, 50.0)
             model.evaluate(x, y)
-            self.assertEqual(self.evaluate(r_obj.true_positives), 50.0)
-            self.assertEqual(self.evaluate(r_obj.false_negatives), 50.0)
+            tp, fn = self.evaluate(
+                [r_obj.true_positives, r_obj.false_negatives]
+            )
+            self.assertEqual(tp, 50.0)
+            self.assertEqual(fn, 50.0)
         finally:
             backend.set_floatx("float32")
 
@@ -2467,12 +2381,13 @@ class ResetStatesTest(test_combinations.TestCase):
             m.reset_state()
             m.update_state(100)
 
+        # Trace once up front; in graph mode, calling the concrete function
+        # returns its call op, so there is no need to scan the graph for it.
+        reset_in_concrete_fn = reset_in_fn.get_concrete_function()
         for _ in range(5):
-            reset_in_fn()
+            reset_op = reset_in_concrete_fn()
             if not tf.executing_eagerly():
-                self.evaluate(
-                    tf.compat.v1.get_default_graph().get_operations()[-1]
-                )
+                self.evaluate(reset_op)
         self.assertEqual(self.evaluate(m.count), 1)
 
 
@@ -2483,254 +2398,123 @@ class MergeStateTest(test_combinations.TestCase):
             ValueError, "Metric .* is not compatible with .*"
         ):
             obj1 = metrics.FalsePositives()
-            self.evaluate(tf.compat.v1.variables_initializer(obj1.variables))
             obj2 = metrics.Accuracy()
-            self.evaluate(tf.compat.v1.variables_initializer(obj2.variables))
+            _initialize_variables(self, obj1, obj2)
             self.evaluate(obj1.merge_state([obj2]))
 
     def test_merge_state_accuracy(self):
-        a_objs = []
-        for y_true, y_pred in zip(
-            [[[1], [2]], [[3], [4]]], [[[0], [2]], [[3], [4]]]
-        ):
-            a_obj = metrics.Accuracy()
-            a_objs.append(a_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(a_obj.variables))
-            self.evaluate(a_obj.update_state(y_true, y_pred))
-        self.evaluate(a_objs[0].merge_state(a_objs[1:]))
+        a_objs = [metrics.Accuracy() for _ in range(2)]
+        _initialize_variables(self, *a_objs)
+        _update_and_merge_states(
+            self, a_objs, [[1], [2], [3], [4]], [[0], [2], [3], [4]]
+        )
         self.assertEqual(self.evaluate(a_objs[0].total), 3.0)
         self.assertEqual(self.evaluate(a_objs[0].count), 4.0)
         self.assertEqual(self.evaluate(a_objs[0].result()), 0.75)
 
     def test_merge_state_false_positives(self):
-        fp_objs = []
-        for _ in range(4):
-            fp_obj = metrics.FalsePositives()
-            fp_objs.append(fp_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(fp_obj.variables))
-            y_true = np.zeros((25, 1))
-            y_pred = np.ones((25, 1))
-            self.evaluate(fp_obj.update_state(y_true, y_pred))
-        self.evaluate(fp_objs[0].merge_state(fp_objs[1:]))
+        fp_objs = [metrics.FalsePositives() for _ in range(4)]
+        _initialize_variables(self, *fp_objs)
+        _update_and_merge_states(self, fp_objs, _ZEROS_Y, _ONES_Y)
         self.assertEqual(self.evaluate(fp_objs[0].accumulator), 100.0)
 
     def test_merge_state_false_negatives(self):
-        fn_objs = []
-        for _ in range(4):
-            fn_obj = metrics.FalseNegatives()
-            fn_objs.append(fn_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(fn_obj.variables))
-            y_true = np.ones((25, 1))
-            y_pred = np.zeros((25, 1))
-            self.evaluate(fn_obj.update_state(y_true, y_pred))
-        self.evaluate(fn_objs[0].merge_state(fn_objs[1:]))
+        fn_objs = [metrics.FalseNegatives() for _ in range(4)]
+        _initialize_variables(self, *fn_objs)
+        _update_and_merge_states(self, fn_objs, _ONES_Y, _ZEROS_Y)
         self.assertEqual(self.evaluate(fn_objs[0].accumulator), 100.0)
 
     def test_merge_state_true_negatives(self):
-        tn_objs = []
-        for _ in range(4):
-            tn_obj = metrics.TrueNegatives()
-            tn_objs.append(tn_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(tn_obj.variables))
-            y_true = np.zeros((25, 1))
-            y_pred = np.zeros((25, 1))
-            self.evaluate(tn_obj.update_state(y_true, y_pred))
-        self.evaluate(tn_objs[0].merge_state(tn_objs[1:]))
+        tn_objs = [metrics.TrueNegatives() for _ in range(4)]
+        _initialize_variables(self, *tn_objs)
+        _update_and_merge_states(self, tn_objs, _ZEROS_Y, _ZEROS_Y)
         self.assertEqual(self.evaluate(tn_objs[0].accumulator), 100.0)
 
     def test_merge_state_true_positives(self):
-        tp_objs = []
-        for _ in range(4):
-            tp_obj = metrics.TruePositives()
-            tp_objs.append(tp_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(tp_obj.variables))
-            y_true = np.ones((25, 1))
-            y_pred = np.ones((25, 1))
-            self.evaluate(tp_obj.update_state(y_true, y_pred))
-        self.evaluate(tp_objs[0].merge_state(tp_objs[1:]))
+        tp_objs = [metrics.TruePositives() for _ in range(4)]
+        _initialize_variables(self, *tp_objs)
+        _update_and_merge_states(self, tp_objs, _ONES_Y, _ONES_Y)
         self.assertEqual(self.evaluate(tp_objs[0].accumulator), 100.0)
 
     def test_merge_state_precision(self):
-        p_objs = []
-        for _ in range(5):
-            p_obj = metrics.Precision()
-            p_objs.append(p_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(p_obj.variables))
-            y_true = np.concatenate((np.ones((10, 1)), np.zeros((10, 1))))
-            y_pred = np.concatenate((np.ones((10, 1)), np.ones((10, 1))))
-            self.evaluate(p_obj.update_state(y_true, y_pred))
-        self.evaluate(p_objs[0].merge_state(p_objs[1:]))
+        p_objs = [metrics.Precision() for _ in range(5)]
+        _initialize_variables(self, *p_objs)
+        y_true = _blocks([1, 0] * 5, rows=10, cols=1)
+        _update_and_merge_states(self, p_objs, y_true, _ONES_Y)
         self.assertEqual(self.evaluate(p_objs[0].true_positives), 50.0)
         self.assertEqual(self.evaluate(p_objs[0].false_positives), 50.0)
 
     def test_merge_state_recall(self):
-        r_objs = []
-        for _ in range(5):
-            r_obj = metrics.Recall()
-            r_objs.append(r_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(r_obj.variables))
-            y_true = np.concatenate((np.ones((10, 1)), np.ones((10, 1))))
-            y_pred = np.concatenate((np.ones((10, 1)), np.zeros((10, 1))))
-            self.evaluate(r_obj.update_state(y_true, y_pred))
-        self.evaluate(r_objs[0].merge_state(r_objs[1:]))
+        r_objs = [metrics.Recall() for _ in range(5)]
+        _initialize_variables(self, *r_objs)
+        y_pred = _blocks([1, 0] * 5, rows=10, cols=1)
+        _update_and_merge_states(self, r_objs, _ONES_Y, y_pred)
         self.assertEqual(self.evaluate(r_objs[0].true_positives), 50.0)
         self.assertEqual(self.evaluate(r_objs[0].false_negatives), 50.0)
 
     def test_merge_state_sensitivity_at_specificity(self):
-        sas_objs = []
-        for _ in range(5):
-            sas_obj = metrics.SensitivityAtSpecificity(0.5, num_thresholds=1)
-            sas_objs.append(sas_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(sas_obj.variables))
-            y_true = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                )
-            )
-            y_pred = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                )
-            )
-            self.evaluate(sas_obj.update_state(y_true, y_pred))
-        self.evaluate(sas_objs[0].merge_state(sas_objs[1:]))
+        sas_objs = [
+            metrics.SensitivityAtSpecificity(0.5, num_thresholds=1)
+            for _ in range(5)
+        ]
+        _initialize_variables(self, *sas_objs)
+        _update_and_merge_states(self, sas_objs, _MERGE_Y_TRUE, _MERGE_Y_PRED)
         self.assertEqual(self.evaluate(sas_objs[0].true_positives), 25.0)
         self.assertEqual(self.evaluate(sas_objs[0].false_positives), 25.0)
         self.assertEqual(self.evaluate(sas_objs[0].false_negatives), 25.0)
         self.assertEqual(self.evaluate(sas_objs[0].true_negatives), 25.0)
 
     def test_merge_state_specificity_at_sensitivity(self):
-        sas_objs = []
-        for _ in range(5):
-            sas_obj = metrics.SpecificityAtSensitivity(0.5, num_thresholds=1)
-            sas_objs.append(sas_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(sas_obj.variables))
-            y_true = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                )
-            )
-            y_pred = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                )
-            )
-            self.evaluate(sas_obj.update_state(y_true, y_pred))
-        self.evaluate(sas_objs[0].merge_state(sas_objs[1:]))
+        sas_objs = [
+            metrics.SpecificityAtSensitivity(0.5, num_thresholds=1)
+            for _ in range(5)
+        ]
+        _initialize_variables(self, *sas_objs)
+        _update_and_merge_states(self, sas_objs, _MERGE_Y_TRUE, _MERGE_Y_PRED)
         self.assertEqual(self.evaluate(sas_objs[0].true_positives), 25.0)
         self.assertEqual(self.evaluate(sas_objs[0].false_positives), 25.0)
         self.assertEqual(self.evaluate(sas_objs[0].false_negatives), 25.0)
         self.assertEqual(self.evaluate(sas_objs[0].true_negatives), 25.0)
 
     def test_merge_state_precision_at_recall(self):
-        par_objs = []
-        for _ in range(5):
-            par_obj = metrics.PrecisionAtRecall(recall=0.5, num_thresholds=1)
-            par_objs.append(par_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(par_obj.variables))
-            y_true = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                )
-            )
-            y_pred = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                )
-            )
-            self.evaluate(par_obj.update_state(y_true, y_pred))
-        self.evaluate(par_objs[0].merge_state(par_objs[1:]))
+        par_objs = [
+            metrics.PrecisionAtRecall(recall=0.5, num_thresholds=1)
+            for _ in range(5)
+        ]
+        _initialize_variables(self, *par_objs)
+        _update_and_merge_states(self, par_objs, _MERGE_Y_TRUE, _MERGE_Y_PRED)
         self.assertEqual(self.evaluate(par_objs[0].true_positives), 25.0)
         self.assertEqual(self.evaluate(par_objs[0].false_positives), 25.0)
         self.assertEqual(self.evaluate(par_objs[0].false_negatives), 25.0)
         self.assertEqual(self.evaluate(par_objs[0].true_negatives), 25.0)
 
     def test_merge_state_recall_at_precision(self):
-        rap_objs = []
-        for _ in range(5):
-            rap_obj = metrics.PrecisionAtRecall(recall=0.5, num_thresholds=1)
-            rap_objs.append(rap_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(rap_obj.variables))
-            y_true = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                )
-            )
-            y_pred = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                )
-            )
-            self.evaluate(rap_obj.update_state(y_true, y_pred))
-        self.evaluate(rap_objs[0].merge_state(rap_objs[1:]))
+        rap_objs = [
+            metrics.PrecisionAtRecall(recall=0.5, num_thresholds=1)
+            for _ in range(5)
+        ]
+        _initialize_variables(self, *rap_objs)
+        _update_and_merge_states(self, rap_objs, _MERGE_Y_TRUE, _MERGE_Y_PRED)
         self.assertEqual(self.evaluate(rap_objs[0].true_positives), 25.0)
         self.assertEqual(self.evaluate(rap_objs[0].false_positives), 25.0)
         self.assertEqual(self.evaluate(rap_objs[0].false_negatives), 25.0)
         self.assertEqual(self.evaluate(rap_objs[0].true_negatives), 25.0)
 
     def test_merge_state_auc(self):
-        auc_objs = []
-        for _ in range(5):
-            auc_obj = metrics.AUC(num_thresholds=3)
-            auc_objs.append(auc_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(auc_obj.variables))
-            y_true = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                )
-            )
-            y_pred = np.concatenate(
-                (
-                    np.ones((5, 1)),
-                    np.zeros((5, 1)),
-                    np.zeros((5, 1)),
-                    np.ones((5, 1)),
-                )
-            )
-            self.evaluate(auc_obj.update_state(y_true, y_pred))
-        self.evaluate(auc_objs[0].merge_state(auc_objs[1:]))
+        auc_objs = [metrics.AUC(num_thresholds=3) for _ in range(5)]
+        _initialize_variables(self, *auc_objs)
+        _update_and_merge_states(self, auc_objs, _MERGE_Y_TRUE, _MERGE_Y_PRED)
         self.assertEqual(self.evaluate(auc_objs[0].true_positives[1]), 25.0)
         self.assertEqual(self.evaluate(auc_objs[0].false_positives[1]), 25.0)
         self.assertEqual(self.evaluate(auc_objs[0].false_negatives[1]), 25.0)
         self.assertEqual(self.evaluate(auc_objs[0].true_negatives[1]), 25.0)
 
     def test_merge_state_mean_iou(self):
-        m_objs = []
-        for y_true, y_pred in zip(
-            [[0], [1], [1], [1]], [[0.5], [1.0], [1.0], [1.0]]
-        ):
-            m_obj = metrics.MeanIoU(num_classes=2)
-            m_objs.append(m_obj)
-            self.evaluate(tf.compat.v1.variables_initializer(m_obj.variables))
-            self.evaluate(m_obj.update_state(y_true, y_pred))
-        self.evaluate(m_objs[0].merge_state(m_objs[1:]))
+        m_objs = [metrics.MeanIoU(num_classes=2) for _ in range(4)]
+        _initialize_variables(self, *m_objs)
+        _update_and_merge_states(
+            self, m_objs, [[0], [1], [1], [1]], [[0.5], [1.0], [1.0], [1.0]]
+        )
         self.assertArrayNear(self.evaluate(m_objs[0].total_cm)[0], [1, 0], 1e-1)
         self.assertArrayNear(self.evaluate(m_objs[0].total_cm)[1], [0, 3], 1e-1)
 
@@ -14,61 +14,82 @@
 # ==============================================================================
 """Public TF-Keras utilities."""
 
-# isort: off
+import importlib
 
-# Serialization related
-from tf_keras.saving.serialization_lib import deserialize_keras_object
-from tf_keras.saving.serialization_lib import serialize_keras_object
 from tf_keras.saving.object_registration import CustomObjectScope
 from tf_keras.saving.object_registration import custom_object_scope
 from tf_keras.saving.object_registration import get_custom_objects
 from tf_keras.saving.object_registration import get_registered_name
 from tf_keras.saving.object_registration import register_keras_serializable
 
-# Dataset related
-from tf_keras.utils.audio_dataset import audio_dataset_from_directory
-from tf_keras.utils.text_dataset import text_dataset_from_directory
-from tf_keras.utils.timeseries_dataset import timeseries_dataset_from_array
-from tf_keras.utils.image_dataset import image_dataset_from_directory
-from tf_keras.utils.dataset_utils import split_dataset
+# Everything else is imported on first access (PEP 562), so importing
+# `tf_keras.utils` does not pull in PIL, pydot, the dataset utilities or the
+# sidecar evaluator up front. Maps each public name to its defining module.
+_LAZY_SYMBOLS = {
+    # Serialization related
+    "deserialize_keras_object": "tf_keras.saving.serialization_lib",
+    "serialize_keras_object": "tf_keras.saving.serialization_lib",
+    # Dataset related
+    "audio_dataset_from_directory": "tf_keras.utils.audio_dataset",
+    "text_dataset_from_directory": "tf_keras.utils.text_dataset",
+    "timeseries_dataset_from_array": "tf_keras.utils.timeseries_dataset",
+    "image_dataset_from_directory": "tf_keras.utils.image_dataset",
+    "split_dataset": "tf_keras.utils.dataset_utils",
+    # Sequence related
+    "GeneratorEnqueuer": "tf_keras.utils.data_utils",
+    "OrderedEnqueuer": "tf_keras.utils.data_utils",
+    "Sequence": "tf_keras.utils.data_utils",
+    "SequenceEnqueuer": "tf_keras.utils.data_utils",
+    # Image related
+    "array_to_img": "tf_keras.utils.image_utils",
+    "img_to_array": "tf_keras.utils.image_utils",
+    "load_img": "tf_keras.utils.image_utils",
+    "save_img": "tf_keras.utils.image_utils",
+    # Python utils
+    "set_random_seed": "tf_keras.utils.tf_utils",
+    "Progbar": "tf_keras.utils.generic_utils",
+    "get_file": "tf_keras.utils.data_utils",
+    # Preprocessing utils
+    "FeatureSpace": "tf_keras.utils.feature_space",
+    # Internal
+    "get_source_inputs": "tf_keras.utils.layer_utils",
+    "warmstart_embedding_matrix": "tf_keras.utils.layer_utils",
+    # Deprecated
+    "normalize": "tf_keras.utils.np_utils",
+    "to_categorical": "tf_keras.utils.np_utils",
+    "to_ordinal": "tf_keras.utils.np_utils",
+    "pad_sequences": "tf_keras.utils.data_utils",
+    # Evaluation related
+    "SidecarEvaluator": "tf_keras.utils.sidecar_evaluator",
+    "SidecarEvaluatorModelExport": "tf_keras.utils.sidecar_evaluator",
+    # Timed Thread
+    "TimedThread": "tf_keras.utils.timed_threads",
+    # Visualization related
+    "model_to_dot": "tf_keras.utils.vis_utils",
+    "plot_model": "tf_keras.utils.vis_utils",
+}
 
-# Sequence related
-from tf_keras.utils.data_utils import GeneratorEnqueuer
-from tf_keras.utils.data_utils import OrderedEnqueuer
-from tf_keras.utils.data_utils import Sequence
-from tf_keras.utils.data_utils import SequenceEnqueuer
+# Submodules that used to be imported eagerly, and so could be reached as
+# attributes (e.g. `tf_keras.utils.np_utils`) without an explicit import.
+_LAZY_SUBMODULES = {
+    module.rpartition(".")[2]: module
+    for module in _LAZY_SYMBOLS.values()
+    if module.startswith(f"{__name__}.")
+}
 
-# Image related
-from tf_keras.utils.image_utils import array_to_img
-from tf_keras.utils.image_utils import img_to_array
-from tf_keras.utils.image_utils import load_img
-from tf_keras.utils.image_utils import save_img
 
-# Python utils
-from tf_keras.utils.tf_utils import set_random_seed
-from tf_keras.utils.generic_utils import Progbar
-from tf_keras.utils.data_utils import get_file
+def __getattr__(name):
+    if name in _LAZY_SYMBOLS:
+        module = importlib.import_module(_LAZY_SYMBOLS[name])
+        value = getattr(module, name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(_LAZY_SUBMODULES[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache the result so later lookups bypass `__getattr__`.
+    globals()[name] = value
+    return value
 
-# Preprocessing utils
-from tf_keras.utils.feature_space import FeatureSpace
 
-# Internal
-from tf_keras.utils.layer_utils import get_source_inputs
-from tf_keras.utils.layer_utils import warmstart_embedding_matrix
-
-# Deprecated
-from tf_keras.utils.np_utils import normalize
-from tf_keras.utils.np_utils import to_categorical
-from tf_keras.utils.np_utils import to_ordinal
-from tf_keras.utils.data_utils import pad_sequences
-
-# Evaluation related
-from tf_keras.utils.sidecar_evaluator import SidecarEvaluator
-from tf_keras.utils.sidecar_evaluator import SidecarEvaluatorModelExport
-
-# Timed Thread
-from tf_keras.utils.timed_threads import TimedThread
-
-# Visualization related
-from tf_keras.utils.vis_utils import model_to_dot
-from tf_keras.utils.vis_utils import plot_model
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SYMBOLS) | set(_LAZY_SUBMODULES))